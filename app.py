@@ -2,36 +2,141 @@ from fastapi import FastAPI, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.templating import Jinja2Templates
-from fastapi.responses import JSONResponse
-from src.pipeline.predict_pipeline import CustomData, PredictPipeline
-from src.utils import load_object
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from typing import List
+import time
+from src.pipeline.predict_pipeline import CustomData, CustomDataBatch, PredictPipeline
+from src.pipeline.model_registry import get_registry, load_json
+from src.pipeline.micro_batcher import MicroBatcher
+from src.pipeline.prediction_cache import PredictionCache
+from src.pipeline.input_schema import InputSchema, InputSchemaConfig
+from src.pipeline.prediction_log import PredictionLogWriter
+from src.pipeline.instrumentation import Gauge, MetricsMiddleware, STAGE_SECONDS, metrics, timed_stage
+from src.logger import logging
 import os
 
 
 app = FastAPI(title="Student Final Grade Predictor", version="1.0.0")
+app.add_middleware(MetricsMiddleware)
 
 # Ensure static directory exists, then mount
 os.makedirs("static", exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
+# One pipeline per process; model and preprocessor are shared through the registry
+predict_pipeline = PredictPipeline()
+# Concurrent /predict requests are scored together off the event loop
+# (window/size via PREDICT_BATCH_WINDOW_MS / PREDICT_MAX_BATCH_ROWS)
+batcher = MicroBatcher(predict_pipeline.predict_records)
+# Resubmitted profiles are answered from here; keys carry the model version
+prediction_cache = PredictionCache(get_registry().version)
+input_schema_config = InputSchemaConfig()
+# Every prediction (sampled via PREDICTION_LOG_SAMPLE_RATE) goes to logs/predictions/predictions.<pid>.jsonl
+prediction_log = PredictionLogWriter()
+
+# Serving-state gauges for /metrics/prometheus, read at scrape time
+metrics.register(Gauge("model_artifact_loads_total", "Artifact deserializations (initial loads and reloads).",
+                       lambda: get_registry().misses, kind="counter"))
+metrics.register(Gauge("model_artifact_reloads_total", "Artifacts reloaded after changing on disk.",
+                       lambda: get_registry().reloads, kind="counter"))
+metrics.register(Gauge("micro_batch_queue_depth", "Requests waiting for the micro-batcher.",
+                       lambda: batcher.stats()["queue_depth"]))
+metrics.register(Gauge("prediction_cache_entries", "Entries in the prediction cache.",
+                       lambda: prediction_cache.stats()["entries"]))
+metrics.register(Gauge("prediction_cache_hits_total", "Prediction cache hits.",
+                       lambda: prediction_cache.hits, kind="counter"))
+metrics.register(Gauge("prediction_cache_misses_total", "Prediction cache misses.",
+                       lambda: prediction_cache.misses, kind="counter"))
+metrics.register(Gauge("prediction_log_dropped_total", "Prediction log entries dropped on a full queue.",
+                       lambda: prediction_log.dropped, kind="counter"))
+
+
+def _observe_parsing(request: Request) -> None:
+    """Time from arrival to handler start: body read, form/JSON parsing and pydantic coercion."""
+    received_at = request.scope.get("state", {}).get("received_at")
+    if received_at is not None:
+        STAGE_SECONDS.observe(time.perf_counter() - received_at, "request_parsing")
+
+
+@app.on_event("startup")
+async def load_artifacts() -> None:
+    await batcher.start()
+    prediction_log.start()
+    try:
+        get_registry().metadata()
+    except Exception as e:
+        # Keep serving /health; /predict reports the error until artifacts are available
+        logging.info(f"Artifact warm-up failed: {e}")
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks() -> None:
+    await batcher.stop()
+    prediction_log.close()
+
+
+class StudentRecord(BaseModel):
+    school: str
+    sex: str
+    age: int
+    address: str
+    famsize: str
+    Pstatus: str
+    Medu: int
+    Fedu: int
+    Mjob: str
+    Fjob: str
+    reason: str
+    guardian: str
+    traveltime: int
+    studytime: int
+    failures: int
+    schoolsup: str
+    famsup: str
+    paid: str
+    activities: str
+    nursery: str
+    higher: str
+    internet: str
+    romantic: str
+    famrel: int
+    freetime: int
+    goout: int
+    Dalc: int
+    Walc: int
+    health: int
+    absences: int
+    G1: int
+    G2: int
+
+
+class BatchPredictRequest(BaseModel):
+    records: List[StudentRecord] = Field(..., min_length=1, max_length=100_000)
+
 
 def _model_name_or_unknown() -> str:
     try:
-        model = load_object("artifacts/model.pkl")
-        return type(model).__name__
+        return get_registry().metadata().model_name
     except Exception:
         return "Unknown"
 
 
 def _load_metrics() -> dict:
     try:
-        import json
-        with open("artifacts/metrics.json", "r", encoding="utf-8") as f:
-            return json.load(f)
+        return get_registry().metadata().metrics
     except Exception:
         return {}
 
+
+def _input_schema():
+    """Schema from artifacts/schema.json (reloaded with the other artifacts); None skips validation."""
+    path = input_schema_config.schema_file_path
+    if not input_schema_config.enabled or not os.path.exists(path):
+        return None
+    return get_registry().get(path, loader=lambda p: InputSchema(load_json(p)))
+
 @app.get("/health", response_class=HTMLResponse)
 async def health() -> str:
     return "OK"
@@ -45,6 +150,15 @@ async def get_home(request: Request):
     )
 
 
+def _render_error(request: Request, message: str, status_code: int):
+    # The form page shows the error; the status lets clients and load tests tell it from a prediction
+    return templates.TemplateResponse(
+        "home.html",
+        {"request": request, "results": None, "model_name": _model_name_or_unknown(), "metrics": _load_metrics(), "error": message},
+        status_code=status_code,
+    )
+
+
 @app.post("/predict", response_class=HTMLResponse, name="predict")
 async def post_predict(
     request: Request,
@@ -81,6 +195,7 @@ async def post_predict(
     G1: int = Form(...),
     G2: int = Form(...),
 ):
+    _observe_parsing(request)
     data = CustomData(
         school=school,
         sex=sex,
@@ -116,19 +231,73 @@ async def post_predict(
         G2=G2,
     )
 
-    pred_df = data.to_dataframe()
-    predict_pipeline = PredictPipeline()
     try:
-        results = predict_pipeline.predict(pred_df)
-        return templates.TemplateResponse(
-            "home.html",
-            {"request": request, "results": float(results[0]), "model_name": _model_name_or_unknown(), "metrics": _load_metrics(), "error": None},
-        )
+        start = time.perf_counter()
+        record = data.to_dict()
+        schema = _input_schema()
+        with timed_stage("validate"):
+            errors = schema.validate_record(record) if schema is not None else {}
+        if errors:
+            return _render_error(request, "Invalid input: " + "; ".join(f"{k}: {v}" for k, v in errors.items()), 422)
+        validate_done = time.perf_counter()
+        key = prediction_cache.key(record) if prediction_cache.enabled else None
+        with timed_stage("cache_lookup"):
+            results = prediction_cache.get(key) if key is not None else None
+        cache_done = time.perf_counter()
+        cache_hit = results is not None
+        if results is None:
+            with timed_stage("micro_batch"):
+                results = await batcher.submit(record)
+            if key is not None:
+                prediction_cache.put(key, results)
+        predict_done = time.perf_counter()
+        prediction_log.log(record, results, get_registry().version(), {
+            "validate": (validate_done - start) * 1000,
+            "cache": (cache_done - validate_done) * 1000,
+            "predict": (predict_done - cache_done) * 1000,
+            "total": (predict_done - start) * 1000,
+        }, endpoint="/predict", cache_hit=cache_hit)
+        with timed_stage("render"):
+            return templates.TemplateResponse(
+                "home.html",
+                {"request": request, "results": results, "model_name": _model_name_or_unknown(), "metrics": _load_metrics(), "error": None},
+            )
+    except Exception as e:
+        return _render_error(request, str(e), 500)
+
+
+@app.post("/predict/batch")
+def post_predict_batch(request: Request, payload: BatchPredictRequest):
+    # Plain def: FastAPI runs it in the threadpool so a large batch does not block the event loop
+    _observe_parsing(request)
+    start = time.perf_counter()
+    try:
+        # Columnar arrays straight from the validated records; row order is preserved end to end
+        batch = CustomDataBatch.from_records(payload.records)
+        columns_done = time.perf_counter()
+        schema = _input_schema()
+        with timed_stage("validate"):
+            failures = schema.validate_columns(batch.columns, len(batch)) if schema is not None else []
+        if failures:
+            return JSONResponse({"error": "Invalid input", "invalid_rows": len(failures), "errors": failures},
+                                status_code=422)
+        validate_done = time.perf_counter()
+        preds = predict_pipeline.predict_batch(batch)
     except Exception as e:
-        return templates.TemplateResponse(
-            "home.html",
-            {"request": request, "results": None, "model_name": _model_name_or_unknown(), "metrics": _load_metrics(), "error": str(e)},
-        )
+        return JSONResponse({"error": str(e)}, status_code=500)
+    predict_done = time.perf_counter()
+    timings_ms = {
+        "build_columns": (columns_done - start) * 1000,
+        "validate": (validate_done - columns_done) * 1000,
+        "predict": (predict_done - validate_done) * 1000,
+        "total": (time.perf_counter() - start) * 1000,
+    }
+    prediction_log.log_batch(batch.columns, preds, get_registry().version(), timings_ms, endpoint="/predict/batch")
+    return JSONResponse({
+        "count": len(preds),
+        "predictions": [float(p) for p in preds],
+        "timings_ms": timings_ms,
+    })
 
 
 @app.get("/metrics")
@@ -136,4 +305,32 @@ async def get_metrics():
     return JSONResponse(_load_metrics())
 
 
+@app.get("/model")
+async def get_model_info():
+    try:
+        metadata = get_registry().metadata()
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+    return JSONResponse({
+        "version": metadata.version,
+        "model_name": metadata.model_name,
+        "trained_at": metadata.trained_at,
+        "features": metadata.features,
+        "metrics": metadata.metrics,
+    })
+
+
+@app.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    # Runtime metrics of this process; /metrics keeps serving the training metrics
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/stats")
+async def get_stats():
+    return JSONResponse({"registry": get_registry().stats(), "batcher": batcher.stats(),
+                         "prediction_cache": prediction_cache.stats(),
+                         "prediction_log": prediction_log.stats()})
+
+
 # For local run: uvicorn app:app --reload
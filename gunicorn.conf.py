@@ -0,0 +1,64 @@
+"""
+Production serving: gunicorn master + uvicorn workers sharing one copy of the artifacts.
+
+    gunicorn -c gunicorn.conf.py app:app
+    kill -HUP <master pid>    # reload the model without downtime
+
+preload_app imports app in the master; when_ready then loads model.pkl and
+preprocessor.pkl (or the mmap bundle with ARTIFACT_FORMAT=bundle) once and
+gc.freeze()s them, so forked workers share those pages copy-on-write instead of
+each unpickling its own copy. On HUP the master refreshes the registry from disk
+before spawning the new generation of workers, and the old ones finish their
+in-flight requests within graceful_timeout.
+
+The registry's once-a-second file watch is turned off (ARTIFACT_CHECK_INTERVAL=-1)
+unless set explicitly: a worker reloading a changed artifact on its own would
+unpickle a private copy and undo the sharing, so new artifacts go live via HUP.
+"""
+import gc
+import os
+
+os.environ.setdefault("ARTIFACT_CHECK_INTERVAL", "-1")
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# Recycle workers periodically (jitter keeps them from restarting together)
+max_requests = int(os.environ.get("MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", "1000"))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.environ.get("WORKER_TIMEOUT", "60"))
+keepalive = 5
+
+
+def _load_shared_artifacts(server) -> None:
+    from src.pipeline.model_registry import get_registry
+
+    registry = get_registry()
+    try:
+        registry.warm()
+        registry.metadata()
+    except Exception as e:
+        # Workers retry lazily on their first request
+        server.log.warning(f"Artifact preload failed: {e}")
+        return
+    # Move everything loaded so far out of the collector's generations so GC
+    # passes in the workers don't touch (and copy) the shared pages
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Artifacts preloaded, version {registry.version()}, {gc.get_freeze_count()} objects frozen")
+
+
+def when_ready(server) -> None:
+    _load_shared_artifacts(server)
+
+
+def on_reload(server) -> None:
+    # Picks up new artifacts on HUP; the registry only reloads files that changed
+    from src.pipeline.model_registry import get_registry
+
+    gc.unfreeze()
+    get_registry().refresh()
+    _load_shared_artifacts(server)
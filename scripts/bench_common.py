@@ -0,0 +1,15 @@
+"""Helpers shared by the benchmark and load-test scripts."""
+import subprocess
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def git_commit(cwd=ROOT):
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=cwd, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
@@ -0,0 +1,74 @@
+"""
+Benchmark engineer_features on large synthetic frames: the default copy-and-assign
+implementation against the compact single-pass mode (with and without inplace).
+
+    python scripts/bench_engineer.py --rows 1000000 --repeat 3 --json bench_engineer.json
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.features.engineer import engineer_features  # noqa: E402
+from src.utils import make_synthetic_students  # noqa: E402
+
+
+VARIANTS = {
+    "default": lambda df: engineer_features(df),
+    "compact": lambda df: engineer_features(df, compact=True),
+    "compact_inplace": lambda df: engineer_features(df, compact=True, inplace=True),
+}
+
+
+def bench_variant(name, df, repeat):
+    times = []
+    peak = 0
+    for _ in range(repeat):
+        frame = df.copy() if name.endswith("inplace") else df
+        tracemalloc.start()
+        start = time.perf_counter()
+        out = VARIANTS[name](frame)
+        times.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del out, frame
+    return {
+        "min_s": min(times),
+        "median_s": sorted(times)[len(times) // 2],
+        "peak_alloc_mb": peak / 2**20,
+    }
+
+
+def run(rows=1_000_000, repeat=3, seed=42):
+    df = make_synthetic_students(rows, seed=seed).drop(columns=["G3"])
+    input_mb = df.memory_usage(deep=False).sum() / 2**20
+    results = {name: bench_variant(name, df, repeat) for name in VARIANTS}
+    return {"rows": rows, "repeat": repeat, "input_mb": input_mb, "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args()
+
+    report = run(args.rows, args.repeat, args.seed)
+    print(f"engineer_features on {report['rows']:,} rows (input {report['input_mb']:.1f} MB without string payloads)")
+    baseline = report["results"]["default"]["min_s"]
+    for name, r in report["results"].items():
+        print(f"  {name:16s} {r['min_s'] * 1000:9.1f} ms  x{baseline / r['min_s']:5.2f}  "
+              f"peak alloc {r['peak_alloc_mb']:8.1f} MB")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Import-time benchmark for the serving entry point.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and reports
+the median cold import time, the slowest modules and whether training-only
+backends leaked into the serving import graph.
+
+    python scripts/bench_import.py                 # import app, 5 runs
+    python scripts/bench_import.py --module src.pipeline.predict_pipeline --runs 10 --json out.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules that only training needs; none of them should be imported by serving code
+TRAINING_ONLY_MODULES = [
+    "sklearn.model_selection",
+    "sklearn.metrics",
+    "catboost",
+    "xgboost",
+    "dill",
+    "joblib",
+    "scipy",
+]
+
+
+def _parse_importtime(stderr: str) -> dict:
+    """Return {module: (self_us, cumulative_us)} from -X importtime output."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure(module: str) -> dict:
+    code = (
+        f"import sys, json; import {module}; "
+        f"print(json.dumps([m for m in {TRAINING_ONLY_MODULES!r} if m in sys.modules]))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    timings = _parse_importtime(proc.stderr)
+    return {
+        "total_ms": timings[module][1] / 1000,
+        "timings": timings,
+        "training_modules_loaded": json.loads(proc.stdout.strip().splitlines()[-1]),
+    }
+
+
+def run(module: str = "app", runs: int = 5, top: int = 15) -> dict:
+    results = [measure(module) for _ in range(runs)]
+    totals = [r["total_ms"] for r in results]
+    last = results[-1]
+    slowest = sorted(last["timings"].items(), key=lambda kv: -kv[1][1])[:top]
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "max_ms": max(totals),
+        "training_modules_loaded": last["training_modules_loaded"],
+        "slowest_cumulative_ms": {name: cumulative / 1000 for name, (_, cumulative) in slowest},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the result as JSON to this path")
+    args = parser.parse_args()
+
+    result = run(args.module, args.runs, args.top)
+    print(f"import {result['module']}: median {result['median_ms']:.1f} ms "
+          f"(min {result['min_ms']:.1f}, max {result['max_ms']:.1f}, {result['runs']} runs)")
+    print(f"training-only modules loaded: {result['training_modules_loaded'] or 'none'}")
+    print("slowest imports (cumulative ms):")
+    for name, ms in result["slowest_cumulative_ms"].items():
+        print(f"  {ms:9.1f}  {name}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Benchmark suite for the training and inference hot paths.
+
+Every benchmark runs on synthetic data scaled up from notebook/data/student_data.csv
+(fixed seed) and reports the median/min wall time over --repeat runs:
+
+    engineer_features      default and compact mode
+    grab_col_names         profiling from scratch, and again with the profile cache warm
+    preprocessor_transform shipped preprocessor.pkl
+    predict_<n>            PredictPipeline.predict at batch sizes 1/100/10k/1M
+    predict_record         single-record compiled path
+    artifact_load_*        unpickling model.pkl + preprocessor.pkl, cold (new process) and warm
+    app_import             cold `import app` in a fresh interpreter
+    fit_<model>            per-candidate search time in evaluate_models
+
+    python scripts/bench_suite.py --json bench/base.json
+    python scripts/bench_suite.py --baseline bench/base.json --threshold 0.15 --json bench/new.json
+    python scripts/bench_suite.py --quick --only predict
+
+With --baseline, any benchmark whose median is more than --threshold slower than
+in the baseline is flagged, and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import numpy as np  # noqa: E402
+
+from bench_common import git_commit  # noqa: E402
+from src.features.column_profile import clear_profile_cache  # noqa: E402
+from src.features.engineer import engineer_features  # noqa: E402
+from src.features.schema import CUSTOM_DATA_FIELDS  # noqa: E402
+from src.pipeline.predict_pipeline import PredictPipeline  # noqa: E402
+from src.utils import grab_col_names, load_object, make_synthetic_students  # noqa: E402
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(times), "min_s": min(times), "repeat": repeat}
+
+
+class Suite:
+    def __init__(self, repeat=5, sizes=(1, 100, 10_000, 1_000_000), rows=100_000, seed=42):
+        self.repeat = repeat
+        self.sizes = sizes
+        self.rows = rows
+        self.seed = seed
+        self._frames = {}
+
+    def frame(self, n_rows):
+        if n_rows not in self._frames:
+            df = make_synthetic_students(n_rows, seed=self.seed)
+            self._frames[n_rows] = df[list(CUSTOM_DATA_FIELDS)]
+        return self._frames[n_rows]
+
+    def repeat_for(self, n_rows):
+        # Keep the 1M-row cases to a few runs
+        return max(1, min(self.repeat, 2)) if n_rows >= 1_000_000 else self.repeat
+
+    def bench_engineer_features(self):
+        df = self.frame(self.rows)
+        return {
+            "engineer_features": {**timed(lambda: engineer_features(df), self.repeat), "rows": self.rows},
+            "engineer_features_compact": {**timed(lambda: engineer_features(df, compact=True), self.repeat),
+                                          "rows": self.rows},
+        }
+
+    def bench_grab_col_names(self):
+        df = self.frame(self.rows)
+
+        def cold():
+            clear_profile_cache()
+            grab_col_names(df)
+
+        return {
+            "grab_col_names": {**timed(cold, self.repeat), "rows": self.rows},
+            "grab_col_names_cached": {**timed(lambda: grab_col_names(df), self.repeat), "rows": self.rows},
+        }
+
+    def bench_preprocessor_transform(self):
+        preprocessor = load_object(os.path.join(ROOT, "artifacts", "preprocessor.pkl"))
+        n = 10_000
+        features = engineer_features(self.frame(n), compact=True)
+        return {"preprocessor_transform": {**timed(lambda: preprocessor.transform(features), self.repeat),
+                                           "rows": n}}
+
+    def bench_predict(self):
+        pipeline = PredictPipeline()
+        pipeline.predict(self.frame(1))  # loads the artifacts outside the timings
+        results = {}
+        for n in self.sizes:
+            df = self.frame(n)
+            results[f"predict_{n}"] = {**timed(lambda: pipeline.predict(df), self.repeat_for(n)), "rows": n}
+        record = self.frame(1).to_dict("records")[0]
+        results["predict_record"] = {**timed(lambda: pipeline.predict_record(record), self.repeat * 20), "rows": 1}
+        return results
+
+    def bench_artifact_load(self):
+        paths = [os.path.join(ROOT, "artifacts", name) for name in ("model.pkl", "preprocessor.pkl")]
+        # Cold: fresh interpreter, so the sklearn/dill imports pulled in by unpickling count too
+        code = ("import time; t = time.perf_counter(); from src.utils import load_object; "
+                f"[load_object(p) for p in {paths!r}]; print(time.perf_counter() - t)")
+        cold = []
+        for _ in range(self.repeat):
+            proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+            cold.append(float(proc.stdout.strip().splitlines()[-1]))
+        [load_object(p) for p in paths]  # warm: imports already done, only unpickling is timed
+        return {
+            "artifact_load_cold": {"median_s": statistics.median(cold), "min_s": min(cold), "repeat": self.repeat},
+            "artifact_load_warm": timed(lambda: [load_object(p) for p in paths], self.repeat),
+        }
+
+    def bench_app_import(self):
+        from bench_import import measure
+
+        times = [measure("app")["total_ms"] / 1000 for _ in range(self.repeat)]
+        return {"app_import": {"median_s": statistics.median(times), "min_s": min(times), "repeat": self.repeat}}
+
+    def bench_evaluate_models(self):
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.linear_model import LinearRegression, Ridge
+        from sklearn.tree import DecisionTreeRegressor
+        from src.utils import evaluate_models
+
+        preprocessor = load_object(os.path.join(ROOT, "artifacts", "preprocessor.pkl"))
+        df = make_synthetic_students(2_000, seed=self.seed)
+        X = preprocessor.transform(engineer_features(df[list(CUSTOM_DATA_FIELDS)], compact=True))
+        y = df["G3"].to_numpy()
+        split = int(len(X) * 0.8)
+        models = {
+            "LinearRegression": LinearRegression(),
+            "Ridge": Ridge(),
+            "DecisionTree": DecisionTreeRegressor(random_state=42),
+            "RandomForest": RandomForestRegressor(random_state=42, n_jobs=1),
+        }
+        params = {
+            "Ridge": {"alpha": [0.1, 1.0, 10.0]},
+            "DecisionTree": {"max_depth": [4, 8, None]},
+            "RandomForest": {"n_estimators": [25, 50], "max_depth": [8]},
+        }
+        report = evaluate_models(X[:split], y[:split], X[split:], y[split:], models, params,
+                                 cv=3, n_jobs=1, max_workers=1)
+        return {f"fit_{name}": {"median_s": r["fit_seconds"], "min_s": r["fit_seconds"], "repeat": 1,
+                                "rows": split} for name, r in report.items()}
+
+    def benchmarks(self):
+        return [name[len("bench_"):] for name in dir(self) if name.startswith("bench_")]
+
+    def run(self, only=None):
+        results = {}
+        for name in self.benchmarks():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            print(f"running {name} ...", flush=True)
+            results.update(getattr(self, f"bench_{name}")())
+        return results
+
+
+def compare(results, baseline, threshold):
+    """Rows of (name, baseline_s, current_s, ratio, regressed) for benchmarks present in both."""
+    rows = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None or not previous.get("median_s"):
+            continue
+        ratio = current["median_s"] / previous["median_s"]
+        rows.append((name, previous["median_s"], current["median_s"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows for the feature/column benchmarks")
+    parser.add_argument("--sizes", default="1,100,10000,1000000", help="Batch sizes for predict_<n>")
+    parser.add_argument("--quick", action="store_true", help="Skip the 1M-row predict and use 3 repeats")
+    parser.add_argument("--only", nargs="*", default=None, help="Run benchmarks whose name contains any of these")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the results as JSON to this path")
+    parser.add_argument("--baseline", default=None, help="Earlier --json output to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown before flagging (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    sizes = tuple(int(s) for s in args.sizes.split(","))
+    repeat = args.repeat
+    if args.quick:
+        sizes = tuple(s for s in sizes if s < 1_000_000)
+        repeat = min(repeat, 3)
+
+    suite = Suite(repeat=repeat, sizes=sizes, rows=args.rows, seed=args.seed)
+    results = suite.run(args.only)
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+    print(f"\n{'benchmark':32s} {'median ms':>12s} {'min ms':>12s}")
+    for name, r in results.items():
+        print(f"{name:32s} {r['median_s'] * 1000:12.3f} {r['min_s'] * 1000:12.3f}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        print(f"\nagainst {args.baseline} (commit {baseline.get('commit')}), threshold +{args.threshold:.0%}:")
+        for name, old, new, ratio, regressed in rows:
+            print(f"{name:32s} {old * 1000:12.3f} -> {new * 1000:12.3f} ms  x{ratio:5.2f}"
+                  f"{'  REGRESSION' if regressed else ''}")
+        regressions = [row[0] for row in rows if row[4]]
+        report["baseline"] = {"path": args.baseline, "commit": baseline.get("commit"),
+                              "threshold": args.threshold, "regressions": regressions}
+
+    if args.json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_path)), exist_ok=True)
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Load generator for the serving stack.
+
+Replays student records (synthetic ones sampled from notebook/data/student_data.csv,
+or the "features" of a recorded logs/predictions/*.jsonl[.gz] file) against the
+FastAPI app, either in-process through its ASGI interface or over a socket, and
+reports latency percentiles, throughput and error rate.
+
+    python scripts/load_test.py                                      # in-process, closed loop, 8 clients, 10s
+    python scripts/load_test.py --mode open --rate 200 --duration 30
+    python scripts/load_test.py --url http://127.0.0.1:8000 --endpoint batch --batch-size 500
+    python scripts/load_test.py --records logs/predictions/predictions.<pid>.jsonl --json results.json
+
+Closed loop: --concurrency clients each send the next request as soon as the
+previous one returns (measures capacity). Open loop: requests are started on a
+Poisson schedule at --rate per second whatever the response times are, and
+latency is measured from the scheduled start, so queueing delay is not hidden.
+
+Set PREDICT_CACHE_SIZE=0 in the server's environment to measure the model path
+rather than the prediction cache.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from bench_common import git_commit  # noqa: E402
+from src.features.schema import CUSTOM_DATA_FIELDS  # noqa: E402
+from src.utils import make_synthetic_students  # noqa: E402
+
+
+def load_records(path=None, n_records=2000, seed=42) -> list:
+    if path is None:
+        df = make_synthetic_students(n_records, seed=seed)
+        return df[list(CUSTOM_DATA_FIELDS)].to_dict("records")
+    opener = gzip.open if str(path).endswith(".gz") else open
+    records = []
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entry = json.loads(line)
+                records.append(entry.get("features", entry))
+    if not records:
+        raise ValueError(f"No records in {path}")
+    return records
+
+
+def _plain(record: dict) -> dict:
+    return {k: (v.item() if hasattr(v, "item") else v) for k, v in record.items()}
+
+
+def make_client(url=None):
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError("The load test needs httpx (pip install httpx)") from e
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=60.0), None
+    from app import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=60.0), app
+
+
+def make_sender(client, endpoint, records, batch_size):
+    counter = iter(range(sys.maxsize))
+
+    async def send() -> int:
+        i = next(counter)
+        if endpoint == "batch":
+            chunk = [records[(i * batch_size + k) % len(records)] for k in range(batch_size)]
+            response = await client.post("/predict/batch", json={"records": chunk})
+        else:
+            response = await client.post("/predict", data=records[i % len(records)])
+        return response.status_code
+
+    return send
+
+
+async def run_closed(send, concurrency, duration, max_requests):
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + duration
+    issued = 0
+
+    async def client_loop():
+        nonlocal issued
+        while time.perf_counter() < deadline and (max_requests is None or issued < max_requests):
+            issued += 1
+            start = time.perf_counter()
+            try:
+                status = await send()
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return latencies, statuses
+
+
+async def run_open(send, rate, duration, max_requests, seed=0):
+    latencies, statuses, tasks = [], {}, []
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    scheduled = start
+
+    async def one(scheduled_at):
+        try:
+            status = await send()
+        except Exception as e:
+            status = type(e).__name__
+        latencies.append(time.perf_counter() - scheduled_at)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    while scheduled - start < duration and (max_requests is None or len(tasks) < max_requests):
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(one(scheduled)))
+        scheduled += rng.exponential(1.0 / rate)
+    await asyncio.gather(*tasks)
+    return latencies, statuses
+
+
+def summarize(latencies, statuses, elapsed, args, rows_per_request) -> dict:
+    ms = np.asarray(latencies) * 1000
+    ok = sum(n for status, n in statuses.items() if isinstance(status, int) and status < 400)
+    total = len(latencies)
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "target": args.url or "in-process",
+        "endpoint": args.endpoint,
+        "mode": args.mode,
+        "concurrency": args.concurrency if args.mode == "closed" else None,
+        "rate": args.rate if args.mode == "open" else None,
+        "batch_size": rows_per_request,
+        "requests": total,
+        "errors": total - ok,
+        "error_rate": (total - ok) / total if total else 0.0,
+        "status_counts": {str(k): v for k, v in statuses.items()},
+        "seconds": elapsed,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "rows_per_sec": total * rows_per_request / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": float(ms.mean()) if total else None,
+            "p50": float(np.percentile(ms, 50)) if total else None,
+            "p95": float(np.percentile(ms, 95)) if total else None,
+            "p99": float(np.percentile(ms, 99)) if total else None,
+            "max": float(ms.max()) if total else None,
+        },
+    }
+
+
+async def main_async(args) -> dict:
+    records = [_plain(r) for r in load_records(args.records, args.n_records, args.seed)]
+    client, app = make_client(args.url)
+    if app is not None:
+        await app.router.startup()
+    try:
+        send = make_sender(client, args.endpoint, records, args.batch_size)
+        for _ in range(args.warmup):
+            await send()
+        start = time.perf_counter()
+        if args.mode == "open":
+            latencies, statuses = await run_open(send, args.rate, args.duration, args.requests, args.seed)
+        else:
+            latencies, statuses = await run_closed(send, args.concurrency, args.duration, args.requests)
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.aclose()
+        if app is not None:
+            await app.router.shutdown()
+    rows = args.batch_size if args.endpoint == "batch" else 1
+    return summarize(latencies, statuses, elapsed, args, rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="Server base URL; omit to drive app.py in-process")
+    parser.add_argument("--endpoint", choices=["predict", "batch"], default="predict")
+    parser.add_argument("--batch-size", type=int, default=100, help="Records per /predict/batch request")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=8, help="Closed loop: concurrent clients")
+    parser.add_argument("--rate", type=float, default=100.0, help="Open loop: mean requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to generate load")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed requests sent first")
+    parser.add_argument("--records", default=None, help="Replay records from a .jsonl[.gz] prediction log")
+    parser.add_argument("--n-records", type=int, default=2000, help="Synthetic records to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the result as JSON to this path")
+    args = parser.parse_args()
+
+    result = asyncio.run(main_async(args))
+    lat = result["latency_ms"]
+    print(f"{result['requests']} requests in {result['seconds']:.1f}s ({result['mode']} loop, {result['target']}, "
+          f"/{'predict/batch' if args.endpoint == 'batch' else 'predict'})")
+    print(f"throughput {result['throughput_rps']:.1f} req/s, {result['rows_per_sec']:.0f} rows/s, "
+          f"errors {result['errors']} ({result['error_rate']:.2%})")
+    if lat["p50"] is not None:
+        print(f"latency ms: p50 {lat['p50']:.2f}  p95 {lat['p95']:.2f}  p99 {lat['p99']:.2f}  max {lat['max']:.2f}")
+
+    if args.json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_path)), exist_ok=True)
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,10 @@
 import os
+import sys
 import dill
 import json
 import argparse
+from datetime import datetime, timezone
 from sklearn.model_selection import KFold, cross_validate
-try:
-    from src.features.engineer import engineer_features
-except Exception:
-    engineer_features = None
 from pathlib import Path
 import numpy as np
 import pandas as pd
@@ -32,6 +30,13 @@ try:
 except Exception:
     CatBoostRegressor = None  # optional
 
+# Run as `python scripts/run_g3_pipeline.py`: make the repo's src package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.features.engineer import engineer_features  # noqa: E402
+from src.components.early_stopping import with_early_stopping, unwrap_early_stopping  # noqa: E402
+from src.components.training_profiler import profile_candidate, search_costs, write_cost_report  # noqa: E402
+
 
 def load_cleaned_dataframe() -> pd.DataFrame:
     candidates = [
@@ -45,14 +50,42 @@ def load_cleaned_dataframe() -> pd.DataFrame:
     raise FileNotFoundError('cleaned_student_data.csv not found in expected locations')
 
 
+def make_preprocessing_cache(cache_dir):
+    """
+    Disk-backed cache for Pipeline(memory=...). The fitted preprocessor and its
+    transformed output are keyed by a hash of the transformer params and the
+    fold data, so each CV fold is preprocessed once and shared by every model
+    and grid cell (and by the GridSearchCV worker processes).
+    """
+    if not cache_dir:
+        return None
+    from joblib import Memory
+    return Memory(cache_dir, verbose=0)
+
+
+def evict_preprocessing_cache(memory, max_mb):
+    if memory is not None:
+        # Oldest-accessed entries go first once the cache grows past max_mb
+        memory.reduce_size(bytes_limit=int(max_mb * 1024 * 1024))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--cv", action="store_true", help="Run KFold CV in addition to holdout")
+    parser.add_argument("--early-stopping", type=int, default=None, metavar="ROUNDS",
+                        help="Tune XGBoost/CatBoost with early stopping on a held-out split of each fold")
+    parser.add_argument("--bundle", action="store_true",
+                        help="Also write artifacts/bundle (native boosters + numpy arrays) next to the pickles")
+    parser.add_argument("--cache-dir", default=os.path.join('.cache', 'preprocessing'),
+                        help="Directory for cached per-fold preprocessing ('' disables the cache)")
+    parser.add_argument("--profile-dir", default=None,
+                        help="Write a cProfile dump per candidate to this directory")
+    parser.add_argument("--cache-max-mb", type=float, default=512,
+                        help="Size limit of the preprocessing cache; least recently used entries are evicted")
     args = parser.parse_args()
 
     df = load_cleaned_dataframe()
-    if engineer_features is not None:
-        df = engineer_features(df)
+    df = engineer_features(df)
 
     target = 'G3'
     drop_cols = [c for c in ['Total_Score', 'Average_Score'] if c in df.columns]
@@ -89,45 +122,62 @@ def main() -> None:
 
     X_tr, X_te, y_tr, y_te = train_test_split(X, y, test_size=0.2, random_state=42)
 
+    memory = make_preprocessing_cache(args.cache_dir)
+
     rows = []
+    costs = []
     trained = {}
     for name, mdl in models.items():
-        pipe = Pipeline(steps=[('prep', preprocessor), ('model', mdl)])
-
-        # Small GridSearch for RF, XGB, CatBoost
-        if name == 'Random_Forest':
-            param_grid = {
-                'model__n_estimators': [300, 600],
-                'model__max_depth': [None, 10, 20, 30],
-                'model__min_samples_split': [2, 5, 10],
-                'model__min_samples_leaf': [1, 2, 4],
-                'model__max_features': ['sqrt', 'log2']
-            }
-            gs = GridSearchCV(pipe, param_grid=param_grid, cv=3, scoring='r2', n_jobs=-1, verbose=0)
-            gs.fit(X_tr, y_tr)
-            pipe = gs.best_estimator_
-        elif name == 'XGBRegressor' and XGBRegressor is not None:
-            param_grid = {
-                'model__n_estimators': [300, 600],
-                'model__max_depth': [3, 5],
-                'model__learning_rate': [0.05, 0.1],
-                'model__subsample': [0.8, 1.0],
-                'model__colsample_bytree': [0.8, 1.0]
-            }
-            gs = GridSearchCV(pipe, param_grid=param_grid, cv=3, scoring='r2', n_jobs=-1, verbose=0)
-            gs.fit(X_tr, y_tr)
-            pipe = gs.best_estimator_
-        elif name == 'CatBoost' and CatBoostRegressor is not None:
-            param_grid = {
-                'model__depth': [4, 6, 8],
-                'model__learning_rate': [0.03, 0.1],
-                'model__iterations': [300, 600]
-            }
-            gs = GridSearchCV(pipe, param_grid=param_grid, cv=3, scoring='r2', n_jobs=-1, verbose=0)
-            gs.fit(X_tr, y_tr)
-            pipe = gs.best_estimator_
-        else:
-            pipe.fit(X_tr, y_tr)
+        pipe = Pipeline(steps=[('prep', preprocessor), ('model', mdl)], memory=memory)
+
+        # Wall/CPU time, peak RSS and fit counts per candidate for the cost report
+        with profile_candidate(name, args.profile_dir) as cost:
+            # Small GridSearch for RF, XGB, CatBoost
+            if name == 'Random_Forest':
+                param_grid = {
+                    'model__n_estimators': [300, 600],
+                    'model__max_depth': [None, 10, 20, 30],
+                    'model__min_samples_split': [2, 5, 10],
+                    'model__min_samples_leaf': [1, 2, 4],
+                    'model__max_features': ['sqrt', 'log2']
+                }
+                gs = GridSearchCV(pipe, param_grid=param_grid, cv=3, scoring='r2', n_jobs=-1, verbose=0)
+                gs.fit(X_tr, y_tr)
+                cost.update(search_costs(gs))
+                pipe = gs.best_estimator_
+            elif name == 'XGBRegressor' and XGBRegressor is not None:
+                param_grid = {
+                    'model__n_estimators': [300, 600],
+                    'model__max_depth': [3, 5],
+                    'model__learning_rate': [0.05, 0.1],
+                    'model__subsample': [0.8, 1.0],
+                    'model__colsample_bytree': [0.8, 1.0]
+                }
+                if args.early_stopping:
+                    # Rounds are picked per fold by early stopping instead of being grid-searched
+                    es_mdl, param_grid = with_early_stopping(mdl, param_grid, args.early_stopping, prefix='model__')
+                    pipe = Pipeline(steps=[('prep', preprocessor), ('model', es_mdl)], memory=memory)
+                gs = GridSearchCV(pipe, param_grid=param_grid, cv=3, scoring='r2', n_jobs=-1, verbose=0)
+                gs.fit(X_tr, y_tr)
+                cost.update(search_costs(gs))
+                pipe = gs.best_estimator_
+            elif name == 'CatBoost' and CatBoostRegressor is not None:
+                param_grid = {
+                    'model__depth': [4, 6, 8],
+                    'model__learning_rate': [0.03, 0.1],
+                    'model__iterations': [300, 600]
+                }
+                if args.early_stopping:
+                    # Rounds are picked per fold by early stopping instead of being grid-searched
+                    es_mdl, param_grid = with_early_stopping(mdl, param_grid, args.early_stopping, prefix='model__')
+                    pipe = Pipeline(steps=[('prep', preprocessor), ('model', es_mdl)], memory=memory)
+                gs = GridSearchCV(pipe, param_grid=param_grid, cv=3, scoring='r2', n_jobs=-1, verbose=0)
+                gs.fit(X_tr, y_tr)
+                cost.update(search_costs(gs))
+                pipe = gs.best_estimator_
+            else:
+                pipe.fit(X_tr, y_tr)
+                cost.update(n_cells=1, n_fits=1)
 
         # Evaluate
         y_pred = pipe.predict(X_te)
@@ -135,6 +185,7 @@ def main() -> None:
         rmse = np.sqrt(mean_squared_error(y_te, y_pred))
         mae = mean_absolute_error(y_te, y_pred)
         rows.append({'Model': name, 'R2': r2, 'RMSE': rmse, 'MAE': mae})
+        costs.append({**cost, 'R2': r2, 'RMSE': rmse, 'MAE': mae})
         trained[name] = pipe
 
         if args.cv:
@@ -144,6 +195,8 @@ def main() -> None:
             mean_rmse = float(-np.mean(cv_scores['test_neg_root_mean_squared_error']))
             print(f"CV [{name}] R2: {mean_r2:.3f} | RMSE: {mean_rmse:.3f}")
 
+        evict_preprocessing_cache(memory, args.cache_max_mb)
+
     results_df = pd.DataFrame(rows).sort_values('R2', ascending=False)
     print('\nModel comparison (target=G3):')
     print(results_df)
@@ -162,7 +215,7 @@ def main() -> None:
             cat_names = best_pipe.named_steps['prep'].named_transformers_['cat'].get_feature_names(cat_cols)
         feature_names = list(num_names) + list(cat_names)
 
-        model = best_pipe.named_steps['model']
+        model = unwrap_early_stopping(best_pipe.named_steps['model'])
         importances = None
         if hasattr(model, 'feature_importances_'):
             importances = model.feature_importances_
@@ -179,6 +232,9 @@ def main() -> None:
 
     os.makedirs('artifacts', exist_ok=True)
     results_df.to_csv('artifacts/model_comparison_g3.csv', index=False)
+    cost_df = write_cost_report(costs, 'artifacts/training_cost_g3.csv', 'artifacts/training_cost_cells_g3.csv')
+    print('\nTraining cost (most expensive first):')
+    print(cost_df[['model', 'wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'n_fits', 'R2']])
     if feat_df is not None:
         feat_df.to_csv('artifacts/feature_importance_g3.csv', index=False)
 
@@ -187,11 +243,24 @@ def main() -> None:
         with open('artifacts/preprocessor.pkl', 'wb') as f:
             dill.dump(best_pipe.named_steps['prep'], f)
         with open('artifacts/model.pkl', 'wb') as f:
-            dill.dump(best_pipe.named_steps['model'], f)
+            dill.dump(unwrap_early_stopping(best_pipe.named_steps['model']), f)
         print("\nSaved artifacts/preprocessor.pkl and artifacts/model.pkl")
+        if args.bundle:
+            from src.pipeline.artifact_bundle import save_bundle
+            save_bundle(os.path.join('artifacts', 'bundle'), unwrap_early_stopping(best_pipe.named_steps['model']),
+                        best_pipe.named_steps['prep'])
+            print("Saved artifacts/bundle")
     except Exception as e:
         print('Saving model/preprocessor failed:', e)
 
+    # Input schema for serving-time validation (allowed categories, numeric ranges)
+    try:
+        from src.features.schema import build_schema, save_schema
+        save_schema(build_schema(X_tr), os.path.join('artifacts', 'schema.json'))
+        print("Saved artifacts/schema.json")
+    except Exception as e:
+        print('Saving input schema failed:', e)
+
     # Save metrics for UI
     try:
         # Find the row for best_name
@@ -201,6 +270,8 @@ def main() -> None:
             'R2': row['R2'] if row else None,
             'RMSE': row['RMSE'] if row else None,
             'MAE': row['MAE'] if row else None,
+            'trained_at': datetime.now(timezone.utc).isoformat(),
+            'features': list(X.columns),
         }
         with open('artifacts/metrics.json', 'w', encoding='utf-8') as f:
             json.dump(metrics, f, ensure_ascii=False, indent=2)
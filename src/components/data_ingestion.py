@@ -10,6 +10,7 @@ from src.components.data_transformation import DataTransformation
 from src.components.data_transformation import DataTransformationConfig
 
 from src.utils import grab_col_names, save_object
+from src.features.schema import build_schema, save_schema
 from src.components.model_trainer import ModelTrainerConfig
 from src.components.model_trainer import ModelTrainer
 
@@ -18,6 +19,7 @@ class DataIngestionConfig:
     train_data_path: str=os.path.join('artifacts','train.csv')
     test_data_path: str=os.path.join('artifacts','test.csv')
     raw_data_path: str=os.path.join('artifacts','data.csv')
+    schema_path: str=os.path.join('artifacts','schema.json')
 
 class DataIngestion:
     def __init__(self):
@@ -36,6 +38,7 @@ class DataIngestion:
             train_set, test_set = train_test_split(df, test_size=0.2, random_state=42)
             
             train_set.to_csv(self.ingestion_config.train_data_path, index=False, header=True)
+            save_schema(build_schema(train_set), self.ingestion_config.schema_path)
             
             test_set.to_csv(self.ingestion_config.test_data_path, index=False, header=True)
 
@@ -0,0 +1,107 @@
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+from sklearn.model_selection import train_test_split
+
+
+# Name of the "number of boosting rounds" parameter per backend
+ITERATION_PARAMS = {
+    "xgboost": "n_estimators",
+    "catboost": "iterations",
+}
+
+
+def booster_backend(estimator):
+    """Return "xgboost"/"catboost" for supported boosted regressors, else None."""
+    module = type(estimator).__module__.split(".")[0]
+    return module if module in ITERATION_PARAMS else None
+
+
+class EarlyStoppingRegressor(RegressorMixin, BaseEstimator):
+    """
+    Fits an XGBRegressor / CatBoostRegressor with early stopping.
+
+    A validation split is carved out of whatever data ``fit`` receives, so inside
+    GridSearchCV every CV fold stops on its own held-out rows. The iteration
+    parameter of ``estimator`` is the upper bound on boosting rounds.
+
+    With refit_full=True (default) the booster is then refit on all of X/y with
+    the best iteration count found on the split, so no training rows are lost
+    to validation; with refit_full=False it is the one trained on the
+    (1 - validation_fraction) split, trimmed to the best iteration. Either way
+    it is available as ``estimator_``.
+    """
+
+    def __init__(self, estimator=None, early_stopping_rounds=30, validation_fraction=0.15, random_state=42,
+                 refit_full=True):
+        self.estimator = estimator
+        self.early_stopping_rounds = early_stopping_rounds
+        self.validation_fraction = validation_fraction
+        self.random_state = random_state
+        self.refit_full = refit_full
+
+    def fit(self, X, y):
+        backend = booster_backend(self.estimator)
+        if backend is None:
+            raise ValueError(f"Early stopping is only supported for {sorted(ITERATION_PARAMS)} estimators")
+
+        X_fit, X_val, y_fit, y_val = train_test_split(
+            X, y, test_size=self.validation_fraction, random_state=self.random_state
+        )
+        estimator = clone(self.estimator)
+
+        if backend == "xgboost":
+            estimator.set_params(early_stopping_rounds=self.early_stopping_rounds)
+            estimator.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+            best_n = int(estimator.best_iteration) + 1
+            # Drop the rounds trained past the best one and record the count in the params
+            trimmed = estimator.get_booster()[:best_n]
+            estimator.set_params(n_estimators=best_n, early_stopping_rounds=None)
+            estimator.load_model(bytearray(trimmed.save_raw("ubj")))
+        else:
+            # use_best_model shrinks the CatBoost model to the best iteration
+            estimator.fit(X_fit, y_fit, eval_set=(X_val, y_val),
+                          early_stopping_rounds=self.early_stopping_rounds, use_best_model=True)
+            best_n = int(estimator.tree_count_)
+
+        if self.refit_full:
+            estimator = clone(self.estimator).set_params(**{ITERATION_PARAMS[backend]: best_n})
+            if backend == "xgboost":
+                estimator.set_params(early_stopping_rounds=None)
+            estimator.fit(X, y, verbose=False)
+
+        self.estimator_ = estimator
+        self.best_iteration_ = best_n
+        return self
+
+    def predict(self, X):
+        return self.estimator_.predict(X)
+
+
+def with_early_stopping(model, param_grid, early_stopping_rounds=30, prefix=""):
+    """
+    Wrap a boosted model for early stopping and rewrite its grid accordingly.
+
+    The iteration parameter is removed from the grid (early stopping picks it),
+    its largest grid value becomes the round cap, and the remaining keys are
+    routed to the inner estimator. ``prefix`` is the Pipeline step prefix of the
+    model in ``param_grid`` (e.g. "model__"). Non-boosted models pass through.
+    """
+    backend = booster_backend(model)
+    if backend is None:
+        return model, param_grid
+
+    iteration_key = prefix + ITERATION_PARAMS[backend]
+    model = clone(model)
+    if param_grid.get(iteration_key):
+        model.set_params(**{ITERATION_PARAMS[backend]: max(param_grid[iteration_key])})
+
+    grid = {
+        prefix + "estimator__" + key[len(prefix):]: values
+        for key, values in param_grid.items()
+        if key != iteration_key
+    }
+    return EarlyStoppingRegressor(model, early_stopping_rounds=early_stopping_rounds), grid
+
+
+def unwrap_early_stopping(model):
+    """Return the trimmed booster inside an EarlyStoppingRegressor, else the model itself."""
+    return model.estimator_ if isinstance(model, EarlyStoppingRegressor) else model
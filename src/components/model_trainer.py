@@ -1,33 +1,48 @@
 import os
 import sys
 from dataclasses import dataclass
-
-from sklearn.metrics import r2_score
-from sklearn.neighbors import KNeighborsRegressor
-from sklearn.tree import DecisionTreeRegressor
-from sklearn.ensemble import RandomForestRegressor, AdaBoostRegressor,GradientBoostingRegressor
-from sklearn.svm import SVR
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
-from sklearn.model_selection import RandomizedSearchCV
-from catboost import CatBoostRegressor
-from xgboost import XGBRegressor
-
+from typing import Optional
 
 from src.exception import CustomException
 from src.logger import logging
 from src.utils import save_object, evaluate_models
+from src.components.training_profiler import write_cost_report
 
 
 @dataclass
 class ModelTrainerConfig:
     trained_model_file_path= os.path.join("artifacts","model.pkl")
+    # Total worker processes for model selection; None uses every core
+    max_workers: Optional[int] = None
+    # "grid" (exhaustive), "random" (n_iter cells per model) or "halving" (successive halving)
+    search: str = "grid"
+    n_iter: int = 20
+    # Wall-clock budget in seconds for the whole model selection; None means unlimited
+    time_budget: Optional[float] = None
+    # Patience for XGBoost/CatBoost early stopping on a held-out split of each fold; None disables it
+    early_stopping_rounds: Optional[int] = None
+    # Per-candidate cost/accuracy report and per-grid-cell timings
+    cost_report_file_path: str = os.path.join("artifacts", "training_cost.csv")
+    cost_cells_file_path: str = os.path.join("artifacts", "training_cost_cells.csv")
+    # Directory for per-candidate cProfile dumps; None disables cProfile
+    profile_dir: Optional[str] = None
 
 class ModelTrainer:
-    def __init__(self):
-        self.model_trainer_config = ModelTrainerConfig()
+    def __init__(self, config: ModelTrainerConfig = None):
+        self.model_trainer_config = config or ModelTrainerConfig()
 
     def initiate_model_trainer(self, train_array, test_array):
         try:
+            # Estimator backends are imported on use so importing this module stays cheap
+            from sklearn.metrics import r2_score
+            from sklearn.neighbors import KNeighborsRegressor
+            from sklearn.tree import DecisionTreeRegressor
+            from sklearn.ensemble import RandomForestRegressor, AdaBoostRegressor
+            from sklearn.linear_model import LinearRegression, Ridge, Lasso
+            from catboost import CatBoostRegressor
+            from xgboost import XGBRegressor
+            from src.components.early_stopping import with_early_stopping, unwrap_early_stopping
+
             logging.info("Split training and test input data")
             X_train, y_train, X_test, y_test =(
                 train_array[:,:-1],
@@ -40,11 +55,12 @@ class ModelTrainer:
                 "Lasso": Lasso(),
                 "Ridge": Ridge(),
                 "K-Neighbors Regressor":KNeighborsRegressor(),
-                "Decision Tree": DecisionTreeRegressor(),
-                "Random Forest Regressor": RandomForestRegressor(),
-                "XGBRegressor": XGBRegressor(),
-                "CatBoosting Regressor": CatBoostRegressor(verbose=False),
-                "AdaBoost Regressor": AdaBoostRegressor()
+                # Fixed seeds keep model selection reproducible regardless of worker count
+                "Decision Tree": DecisionTreeRegressor(random_state=42),
+                "Random Forest Regressor": RandomForestRegressor(random_state=42),
+                "XGBRegressor": XGBRegressor(random_state=42),
+                "CatBoosting Regressor": CatBoostRegressor(verbose=False, random_state=42),
+                "AdaBoost Regressor": AdaBoostRegressor(random_state=42)
             }
             params = {
                         
@@ -103,14 +119,32 @@ class ModelTrainer:
                     }
 
 
-            model_report: dict=evaluate_models(X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test,models= models, params = params)
+            if self.model_trainer_config.early_stopping_rounds is not None:
+                for name in ("XGBRegressor", "CatBoosting Regressor"):
+                    models[name], params[name] = with_early_stopping(
+                        models[name], params[name], self.model_trainer_config.early_stopping_rounds
+                    )
+
+            model_report: dict=evaluate_models(X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test,models= models, params = params,
+                                              max_workers=self.model_trainer_config.max_workers,
+                                              search=self.model_trainer_config.search,
+                                              n_iter=self.model_trainer_config.n_iter,
+                                              time_budget=self.model_trainer_config.time_budget,
+                                              profile_dir=self.model_trainer_config.profile_dir)
+
+            write_cost_report([{"model": name, **scores} for name, scores in model_report.items()],
+                              self.model_trainer_config.cost_report_file_path,
+                              self.model_trainer_config.cost_cells_file_path)
 
-            best_model_score = max(sorted(model_report.values()))
+            test_scores = [scores["test_r2"] for scores in model_report.values()]
+            best_model_score = max(test_scores)
             best_model_name = list(model_report.keys())[
-                list(model_report.values()).index(best_model_score)
+                test_scores.index(best_model_score)
             ]
 
-            best_model = models[best_model_name]
+            # Already refit on the full training set by the search; saved as-is
+            # (boosters trained with early stopping are saved trimmed to their best iteration)
+            best_model = unwrap_early_stopping(models[best_model_name])
 
             if best_model_score<0.6:
                 raise CustomException("No best model found")
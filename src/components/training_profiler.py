@@ -0,0 +1,192 @@
+"""
+Cost accounting for model selection: wall time, CPU time, peak RSS and number of
+fits per candidate, plus fit/score time per grid cell, written as a cost/accuracy
+report next to the model comparison.
+
+    with profile_candidate("Random_Forest", profile_dir="artifacts/profiles") as cost:
+        gs.fit(X, y)
+    cost.update(search_costs(gs))
+
+cpu_seconds is this process; children_cpu_seconds is the CPU time of its
+worker processes. loky keeps its pool alive, so with psutil installed the live
+workers are sampled in a background thread (a worker that exits between two
+samples loses at most one interval); without it only exited children are
+visible to getrusage, so the value is None when the block ran with n_jobs > 1.
+peak_rss_mb is sampled in the same thread. With profile_dir set, each
+candidate also gets a cProfile dump (<name>.prof, readable with pstats or
+snakeviz) of the calling process.
+"""
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import resident_memory_bytes
+
+
+def _worker_processes():
+    """Live descendant processes via psutil, or None when psutil is not installed."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().children(recursive=True)
+
+
+def _worker_cpu_times() -> Optional[dict]:
+    workers = _worker_processes()
+    if workers is None:
+        return None
+    times = {}
+    for proc in workers:
+        try:
+            cpu = proc.cpu_times()
+            times[(proc.pid, proc.create_time())] = cpu.user + cpu.system
+        except Exception:  # exited while being read
+            pass
+    return times
+
+
+class _ResourceSampler(threading.Thread):
+    def __init__(self, interval: float):
+        super().__init__(name="resource-sampler", daemon=True)
+        self.interval = interval
+        self.peak = resident_memory_bytes()
+        # CPU seconds per worker when first and last seen; None without psutil
+        self.cpu_start = _worker_cpu_times()
+        self.cpu_last = dict(self.cpu_start) if self.cpu_start is not None else None
+        self._stop_event = threading.Event()
+
+    def sample(self) -> None:
+        self.peak = max(self.peak, resident_memory_bytes())
+        if self.cpu_last is not None:
+            self.cpu_last.update(_worker_cpu_times() or {})
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        self.sample()
+        return self.peak
+
+    def worker_cpu_seconds(self) -> Optional[float]:
+        if self.cpu_last is None:
+            return None
+        return sum(seconds - self.cpu_start.get(key, 0.0) for key, seconds in self.cpu_last.items())
+
+
+def _children_cpu_seconds() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+@contextmanager
+def profile_candidate(name: str, profile_dir: Optional[str] = None, rss_sample_interval: float = 0.05,
+                      n_jobs: Optional[int] = None):
+    """
+    Measure the block; yields a dict that is filled with the costs when the block
+    exits. n_jobs is the parallelism the block runs with (None: the joblib default).
+    """
+    from joblib import effective_n_jobs
+
+    cost = {"model": name}
+    sampler = _ResourceSampler(rss_sample_interval)
+    sampler.start()
+    # Live pool workers are invisible to getrusage, so without psutil it only covers sequential blocks
+    sequential = effective_n_jobs(n_jobs) == 1
+    profiler = cProfile.Profile() if profile_dir else None
+    wall, cpu, children = time.perf_counter(), time.process_time(), _children_cpu_seconds()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield cost
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        cost["wall_seconds"] = time.perf_counter() - wall
+        cost["cpu_seconds"] = time.process_time() - cpu
+        cost["peak_rss_mb"] = sampler.stop() / 2**20
+        workers = sampler.worker_cpu_seconds()
+        if workers is None and sequential:
+            workers = _children_cpu_seconds() - children
+        cost["children_cpu_seconds"] = workers
+        if profiler is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+            path = os.path.join(profile_dir, re.sub(r"[^\w.-]+", "_", name) + ".prof")
+            profiler.dump_stats(path)
+            cost["profile_path"] = path
+
+
+def search_costs(search) -> dict:
+    """
+    Fit counts and per-cell timings from a fitted *SearchCV. For halving
+    searches every (iteration, cell) pair is a row.
+    """
+    results = search.cv_results_
+    n_splits = getattr(search, "n_splits_", None) or 1
+    cells = []
+    for i, params in enumerate(results["params"]):
+        cell = {
+            "params": params,
+            "fits": n_splits,
+            "mean_fit_seconds": float(results["mean_fit_time"][i]),
+            "mean_score_seconds": float(results["mean_score_time"][i]),
+            "total_seconds": float((results["mean_fit_time"][i] + results["mean_score_time"][i]) * n_splits),
+            "mean_test_score": float(results["mean_test_score"][i]),
+        }
+        if "n_resources" in results:
+            cell["n_resources"] = int(results["n_resources"][i])
+        cells.append(cell)
+    refit = 1 if getattr(search, "refit", False) else 0
+    return {
+        "n_cells": len(cells),
+        "n_fits": len(cells) * n_splits + refit,
+        "cv_fit_seconds": sum(cell["total_seconds"] for cell in cells),
+        "refit_seconds": float(getattr(search, "refit_time_", 0.0) or 0.0),
+        "cells": cells,
+    }
+
+
+def write_cost_report(costs: List[dict], report_file_path: str, cells_file_path: Optional[str] = None) -> pd.DataFrame:
+    """
+    One row per candidate (accuracy columns kept as given, costs added, most
+    expensive first); cells go to a second CSV when cells_file_path is set.
+    """
+    try:
+        rows, cells = [], []
+        for cost in costs:
+            row = {k: v for k, v in cost.items() if k != "cells"}
+            if isinstance(row.get("best_params"), dict):
+                row["best_params"] = str(row["best_params"])
+            rows.append(row)
+            for cell in cost.get("cells") or []:
+                cells.append({"model": cost["model"], **cell, "params": str(cell["params"])})
+
+        report = pd.DataFrame(rows)
+        if "wall_seconds" in report:
+            report = report.sort_values("wall_seconds", ascending=False)
+            report["share_of_wall"] = report["wall_seconds"] / report["wall_seconds"].sum()
+        os.makedirs(os.path.dirname(report_file_path) or ".", exist_ok=True)
+        report.to_csv(report_file_path, index=False)
+        if cells_file_path is not None and cells:
+            pd.DataFrame(cells).sort_values("total_seconds", ascending=False).to_csv(cells_file_path, index=False)
+        logging.info(f"Saved training cost report to {report_file_path}")
+        return report
+
+    except Exception as e:
+        raise CustomException(e, sys)
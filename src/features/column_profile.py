@@ -0,0 +1,187 @@
+"""
+Single-pass column profiling shared by column typing (grab_col_names) and
+input schema generation (build_schema).
+
+    profiles = profile_frame(df)
+    profiles["absences"].n_unique, profiles["Mjob"].categories
+
+Every column is hashed once: pd.factorize gives the null count, the exact
+distinct count and the categories together. Numeric columns longer than
+hll_min_rows whose sample is mostly distinct instead go through a HyperLogLog
+sketch over their 64-bit value hashes (about 1.04 / sqrt(2**precision)
+relative error, 0.8% at the default precision of 14), which is several times
+faster than factorizing them and needs no hash table of all values. Object
+columns are always counted exactly: hashing every string for the sketch costs
+more than factorizing them. min/max/mean/std come from the same numeric array.
+
+Numeric and datetime profiles are cached per column by (name, dtype, length,
+content fingerprint), so a column seen again, e.g. train.csv read back after
+ingestion, is not profiled twice. Object columns are not cached: hashing every
+string for a fingerprint costs as much as profiling them.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.exception import CustomException
+
+
+@dataclass
+class ColumnProfileConfig:
+    # Above this many rows the distinct count comes from HyperLogLog
+    hll_min_rows: int = 1_000_000
+    hll_precision: int = 14
+    # Distinct values are kept as `categories` up to this cardinality
+    max_categories: int = 1000
+    cache_size: int = 512
+    # Values sampled into the HyperLogLog decision
+    fingerprint_sample: int = 4096
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    dtype: str
+    n_rows: int
+    n_null: int
+    n_unique: int
+    approximate: bool = False
+    categories: Optional[List] = None  # distinct non-null values, first-seen order; None if above max_categories
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: Optional[float] = None
+    std: Optional[float] = None
+
+    @property
+    def is_object(self) -> bool:
+        return self.dtype == "object"
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch over precomputed 64-bit hashes."""
+
+    def __init__(self, precision: int = ColumnProfileConfig.hll_precision):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> "HyperLogLog":
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        # Position of the first set bit in the remaining 64 - p bits, via exact bit lengths of 32-bit halves
+        high = (rest >> np.uint64(32)).astype(np.float64)
+        low = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        bit_length = np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+        rank = (64 - p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(estimate))
+
+
+_cache: "OrderedDict[tuple, ColumnProfile]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def clear_profile_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def _fingerprint(values: np.ndarray) -> Optional[tuple]:
+    """
+    Content fingerprint of a numeric/datetime column: plain and position-weighted
+    wraparound sums over all values. None for other columns, which are not cached.
+    """
+    if values.dtype.kind not in "biufmM":
+        return None
+    if values.dtype.itemsize != 8:
+        values = values.astype(np.float64 if values.dtype.kind == "f" else np.int64)
+    words = values.view(np.uint64)
+    weights = np.arange(1, len(words) + 1, dtype=np.uint64)
+    return int(words.sum()), int((words * weights).sum())
+
+
+def _mostly_distinct(values: np.ndarray, config: ColumnProfileConfig) -> bool:
+    sample = values[::max(1, len(values) // config.fingerprint_sample)]
+    return len(pd.unique(sample)) > config.max_categories // 4
+
+
+def _profile(series: pd.Series, config: ColumnProfileConfig) -> ColumnProfile:
+    values = series.to_numpy()
+    categories = None
+    if len(values) > config.hll_min_rows and values.dtype.kind in "iuf" and _mostly_distinct(values, config):
+        null = np.isnan(values) if values.dtype.kind == "f" else np.zeros(len(values), dtype=bool)
+        n_null = int(null.sum())
+        present = values[~null] if n_null else values
+        n_unique = HyperLogLog(config.hll_precision).update(pd.util.hash_array(present)).count()
+        approximate = True
+    else:
+        codes, uniques = pd.factorize(values)
+        n_null, n_unique, approximate = int((codes < 0).sum()), len(uniques), False
+        if n_unique <= config.max_categories:
+            categories = uniques.tolist()
+
+    stats = {}
+    if values.dtype.kind in "iuf" and n_null < len(values):
+        numeric = values.astype(np.float64, copy=False)
+        if n_null:
+            numeric = numeric[~np.isnan(numeric)]
+        stats = {"min": float(numeric.min()), "max": float(numeric.max()), "mean": float(numeric.mean()),
+                 "std": float(numeric.std(ddof=1)) if len(numeric) > 1 else 0.0}
+
+    return ColumnProfile(name=series.name, dtype=str(series.dtype), n_rows=len(values), n_null=n_null,
+                         n_unique=n_unique, approximate=approximate, categories=categories, **stats)
+
+
+def profile_column(series: pd.Series, config: ColumnProfileConfig = None) -> ColumnProfile:
+    """Profile of one column, from the cache when a column with the same fingerprint was profiled before."""
+    config = config or ColumnProfileConfig()
+    fingerprint = _fingerprint(series.to_numpy())
+    if fingerprint is None:
+        return _profile(series, config)
+    key = (series.name, str(series.dtype), len(series), fingerprint,
+           config.hll_min_rows, config.hll_precision, config.max_categories)
+    with _cache_lock:
+        profile = _cache.get(key)
+        if profile is not None:
+            _cache.move_to_end(key)
+            return profile
+    # Profiled outside the lock; a concurrent miss on the same column just computes it twice
+    profile = _profile(series, config)
+    with _cache_lock:
+        _cache[key] = profile
+        while len(_cache) > config.cache_size:
+            _cache.popitem(last=False)
+    return profile
+
+
+def profile_frame(df: pd.DataFrame, config: ColumnProfileConfig = None) -> Dict[str, ColumnProfile]:
+    """Profiles of all columns of df, keyed by column name."""
+    try:
+        config = config or ColumnProfileConfig()
+        return {col: profile_column(df[col], config) for col in df.columns}
+
+    except Exception as e:
+        raise CustomException(e, sys)
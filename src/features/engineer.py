@@ -1,38 +1,93 @@
+from operator import itemgetter
+
+import numpy as np
 import pandas as pd
 
 
-ENGINEERED_COLS = [
-    'has_failures', 'high_studytime', 'avg_parent_edu', 'early_failure',
-    'parents_together', 'big_family', 'urban_student', 'long_travel',
-    'has_internet', 'romantic_rel', 'high_alcohol_use', 'high_absenteeism'
+# One rule per engineered column: (name, input columns, function of those inputs).
+# The functions only use operators, so the same rule runs on numpy arrays, pandas
+# Series and plain scalars; flag rules return booleans.
+FEATURE_RULES = [
+    ('has_failures', ('failures',), lambda failures: failures > 0),
+    ('high_studytime', ('studytime',), lambda studytime: studytime >= 3),
+    ('avg_parent_edu', ('Medu', 'Fedu'), lambda medu, fedu: (medu + fedu) / 2.0),
+    ('early_failure', ('G1',), lambda g1: g1 < 5),
+    ('parents_together', ('Pstatus',), lambda pstatus: pstatus == 'T'),
+    ('big_family', ('famsize',), lambda famsize: famsize == 'GT3'),
+    ('urban_student', ('address',), lambda address: address == 'U'),
+    ('long_travel', ('traveltime',), lambda traveltime: traveltime >= 3),
+    ('has_internet', ('internet',), lambda internet: internet == 'yes'),
+    ('romantic_rel', ('romantic',), lambda romantic: romantic == 'yes'),
+    ('high_alcohol_use', ('Dalc', 'Walc'), lambda dalc, walc: (dalc + walc) >= 6),
+    ('high_absenteeism', ('absences',), lambda absences: absences >= 10),
 ]
 
+ENGINEERED_COLS = [name for name, _, _ in FEATURE_RULES]
+
+_BOOL_TYPES = (bool, np.bool_)
+# FEATURE_RULES with itemgetters for the per-record path, which runs once per request
+_RECORD_RULES = [(name, itemgetter(*inputs), rule, len(inputs)) for name, inputs, rule in FEATURE_RULES]
+
+
+def _apply_rules(df) -> dict:
+    """Raw rule outputs (bool flags, float64 values) for the rules whose inputs are all in df."""
+    cols = df.keys()
+    arrays = {}
+    out = {}
+    for name, inputs, rule in FEATURE_RULES:
+        if all(c in cols for c in inputs):
+            for c in inputs:
+                if c not in arrays:
+                    arrays[c] = np.asarray(df[c])
+            out[name] = rule(*(arrays[c] for c in inputs))
+    return out
+
+
+def engineer_features(df: pd.DataFrame, compact: bool = False, inplace: bool = False) -> pd.DataFrame:
+    """
+    Add the engineered columns to df.
 
-def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
-    d = df.copy()
-    if 'failures' in d.columns:
-        d['has_failures'] = (d['failures'] > 0).astype(int)
-    if 'studytime' in d.columns:
-        d['high_studytime'] = (d['studytime'] >= 3).astype(int)
-    if {'Medu', 'Fedu'}.issubset(d.columns):
-        d['avg_parent_edu'] = (d['Medu'] + d['Fedu']) / 2.0
-    if 'G1' in d.columns:
-        d['early_failure'] = (d['G1'] < 5).astype(int)
-    if 'Pstatus' in d.columns:
-        d['parents_together'] = (d['Pstatus'] == 'T').astype(int)
-    if 'famsize' in d.columns:
-        d['big_family'] = (d['famsize'] == 'GT3').astype(int)
-    if 'address' in d.columns:
-        d['urban_student'] = (d['address'] == 'U').astype(int)
-    if 'traveltime' in d.columns:
-        d['long_travel'] = (d['traveltime'] >= 3).astype(int)
-    if 'internet' in d.columns:
-        d['has_internet'] = (d['internet'] == 'yes').astype(int)
-    if 'romantic' in d.columns:
-        d['romantic_rel'] = (d['romantic'] == 'yes').astype(int)
-    if {'Dalc', 'Walc'}.issubset(d.columns):
-        d['high_alcohol_use'] = ((d['Dalc'] + d['Walc']) >= 6).astype(int)
-    if 'absences' in d.columns:
-        d['high_absenteeism'] = (d['absences'] >= 10).astype(int)
+    compact=True computes every column in one numpy pass into int8 flags and a
+    float32 average and appends them without copying the input columns (the
+    values the preprocessor sees are identical). inplace=True adds the columns
+    to df itself instead of returning a new frame.
+    """
+    if compact:
+        return _engineer_features_compact(df, inplace)
+    d = df if inplace else df.copy()
+    for name, values in _apply_rules(d).items():
+        d[name] = values.astype(int) if values.dtype == bool else values
     return d
 
+
+def engineer_columns(df) -> dict:
+    """Engineered columns as numpy arrays; df is a DataFrame or any mapping of column -> array."""
+    out = {}
+    for name, values in _apply_rules(df).items():
+        if values.dtype == bool:
+            out[name] = values.view(np.int8)  # bool and int8 are both 1 byte: reinterpret, no copy
+        else:
+            out[name] = values.astype(np.float32)
+    return out
+
+
+def _engineer_features_compact(df: pd.DataFrame, inplace: bool) -> pd.DataFrame:
+    # A shallow copy shares the input column blocks; setting a column replaces it
+    # in the copy only, so the caller's frame is left untouched
+    d = df if inplace else df.copy(deep=False)
+    for name, values in engineer_columns(df).items():
+        d[name] = values
+    return d
+
+
+def engineer_record(record: dict) -> dict:
+    """Scalar version of engineer_features for a single record (mapping of column -> value)."""
+    out = {}
+    for name, get_inputs, rule, n_inputs in _RECORD_RULES:
+        try:
+            inputs = get_inputs(record)
+        except KeyError:  # an input column is missing: skip the rule, like engineer_features
+            continue
+        value = rule(*inputs) if n_inputs > 1 else rule(inputs)
+        out[name] = int(value) if type(value) in _BOOL_TYPES else value
+    return out
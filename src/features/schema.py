@@ -0,0 +1,90 @@
+"""
+Input fields of the model and the input schema derived from the training data.
+
+    python -m src.features.schema                            # artifacts/train.csv -> artifacts/schema.json
+
+The schema lists the allowed categories of every categorical field and a numeric
+range for every numeric field (the training min/max widened by range_margin of
+the span, never below 0 for fields that are non-negative in training). It is
+written at ingestion and checked at serving time by src.pipeline.input_schema.
+"""
+import os
+import sys
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+from src.exception import CustomException
+from src.features.column_profile import profile_frame
+from src.logger import logging
+
+
+# Input fields in form/column order with their types; str fields are categorical
+CUSTOM_DATA_FIELDS = {
+    "school": str, "sex": str, "age": int, "address": str, "famsize": str, "Pstatus": str,
+    "Medu": int, "Fedu": int, "Mjob": str, "Fjob": str, "reason": str, "guardian": str,
+    "traveltime": int, "studytime": int, "failures": int, "schoolsup": str, "famsup": str,
+    "paid": str, "activities": str, "nursery": str, "higher": str, "internet": str,
+    "romantic": str, "famrel": int, "freetime": int, "goout": int, "Dalc": int, "Walc": int,
+    "health": int, "absences": int, "G1": int, "G2": int,
+}
+
+
+@dataclass
+class SchemaConfig:
+    schema_file_path: str = os.path.join('artifacts', 'schema.json')
+    train_data_path: str = os.path.join('artifacts', 'train.csv')
+    # Slack around the observed numeric range, as a fraction of (max - min)
+    range_margin: float = 0.25
+
+
+def build_schema(df: pd.DataFrame, range_margin: float = SchemaConfig.range_margin,
+                 profiles: Optional[dict] = None) -> dict:
+    """
+    Allowed categories and numeric ranges of the input fields present in df,
+    taken from the (cached) column profiles; pass `profiles` to reuse them.
+    """
+    try:
+        fields = [name for name in CUSTOM_DATA_FIELDS if name in df.columns]
+        if profiles is None:
+            profiles = profile_frame(df[fields])
+        categorical, numeric = {}, {}
+        for name in fields:
+            profile = profiles[name]
+            if CUSTOM_DATA_FIELDS[name] is str:
+                values = profile.categories
+                if values is None:  # above max_categories
+                    values = df[name].dropna().unique()
+                categorical[name] = sorted(str(v) for v in values)
+            else:
+                if profile.min is None:
+                    values = pd.to_numeric(df[name].dropna())
+                    low, high = float(values.min()), float(values.max())
+                else:
+                    low, high = profile.min, profile.max
+                margin = range_margin * (high - low)
+                numeric[name] = {
+                    "min": max(low - margin, 0.0) if low >= 0 else low - margin,
+                    "max": high + margin,
+                    "observed_min": low,
+                    "observed_max": high,
+                }
+        return {"categorical": categorical, "numeric": numeric, "n_rows": int(len(df))}
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def save_schema(schema: dict, file_path: str = SchemaConfig.schema_file_path) -> None:
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2)
+    logging.info(f"Saved input schema to {file_path}")
+
+
+if __name__ == "__main__":
+    config = SchemaConfig()
+    save_schema(build_schema(pd.read_csv(config.train_data_path), config.range_margin), config.schema_file_path)
+    print(f"Saved {config.schema_file_path}")
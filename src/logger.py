@@ -1,18 +1,184 @@
+"""
+Logging backend: callers keep using `from src.logger import logging` and
+`logging.info(...)`.
+
+Records go through a QueueHandler on the root logger; a QueueListener thread
+formats them and writes to a rotating file, so request and training code never
+waits on disk. Configuration comes from the environment:
+
+    LOG_DIR           directory for all log files (default: logs)
+    LOG_FILE          file name inside LOG_DIR (default: app.log)
+    LOG_LEVEL         default INFO
+    LOG_FORMAT        "text" (default) or "json" (one JSON object per line)
+    LOG_ROTATION      "size" (default, LOG_MAX_BYTES / LOG_BACKUP_COUNT), "time" (LOG_WHEN, e.g. midnight)
+                      or "external" (logrotate or similar; the file is reopened when it is moved)
+
+Rotating renames the file, which only one writer may do, so with "size" and
+"time" every process (gunicorn workers, loky workers, ...) writes its own
+file, app.<pid>.log. With "external" all processes append to LOG_FILE itself.
+
+Importing this module touches no files: the directory and file are created on
+the first record the listener writes. After os.fork() (gunicorn workers,
+multiprocessing) the child gets a fresh queue, file handler and listener thread.
+"""
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import threading
+from datetime import datetime, timezone
+
+
+TEXT_FORMAT = "[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "lineno": record.lineno,
+            "process": record.process,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _LazyDirMixin:
+    """Create the log directory when the file is first opened, not at construction."""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class _RotatingFileHandler(_LazyDirMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+
+class _TimedRotatingFileHandler(_LazyDirMixin, logging.handlers.TimedRotatingFileHandler):
+    pass
+
+
+class _WatchedFileHandler(_LazyDirMixin, logging.handlers.WatchedFileHandler):
+    pass
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue a shallow copy of the record instead of a formatted one: only the
+    message arguments and traceback are resolved on the copy (they may not
+    survive the trip to the listener thread), so other handlers still see the
+    caller's record unchanged; the formatting is left to the file handler.
+    """
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # SimpleQueue.put is thread-safe, so the handler lock is not needed
+        if self.filter(record):
+            self.emit(record)
+            return True
+        return False
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+LOG_DIR = os.environ.get("LOG_DIR", os.path.join(os.getcwd(), "logs"))
+LOG_FILE = os.environ.get("LOG_FILE", "app.log")
+LOG_ROTATION = os.environ.get("LOG_ROTATION", "size")
+
+
+def log_file_path() -> str:
+    """This process's log file."""
+    if LOG_ROTATION == "external":
+        return os.path.join(LOG_DIR, LOG_FILE)
+    stem, ext = os.path.splitext(LOG_FILE)
+    return os.path.join(LOG_DIR, f"{stem}.{os.getpid()}{ext}")
+
+
+def _file_handler() -> logging.Handler:
+    path = log_file_path()
+    if LOG_ROTATION == "external":
+        handler = _WatchedFileHandler(path, encoding="utf-8", delay=True)
+    elif LOG_ROTATION == "time":
+        handler = _TimedRotatingFileHandler(
+            path, when=os.environ.get("LOG_WHEN", "midnight"),
+            backupCount=int(os.environ.get("LOG_BACKUP_COUNT", "7")), encoding="utf-8", delay=True)
+    else:
+        handler = _RotatingFileHandler(
+            path, maxBytes=int(os.environ.get("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            backupCount=int(os.environ.get("LOG_BACKUP_COUNT", "5")), encoding="utf-8", delay=True)
+    if os.environ.get("LOG_FORMAT", "text") == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+_file = _file_handler()
+_queue_handler = _QueueHandler(queue.SimpleQueue())
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener() -> None:
+    global _listener
+    with _listener_lock:
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, _file, respect_handler_level=True)
+        _listener.start()
+
+
+def stop_listener() -> None:
+    """Flush queued records to disk and stop the writer thread (also runs at exit)."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+    _file.close()
+
+
+def _before_fork() -> None:
+    # Hold the file handler's lock so the listener is not mid-write when the process forks
+    _file.acquire()
 
 
-LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
-logs_path = os.path.join(os.getcwd(), "logs", LOG_FILE)
-os.makedirs(logs_path, exist_ok=True)
+def _after_fork_in_parent() -> None:
+    _file.release()
 
 
-LOG_FILE_PATH = os.path.join(logs_path, LOG_FILE)
+def _after_fork_in_child() -> None:
+    # The parent's listener thread does not exist in the child; start over with a fresh queue
+    # and a handler for the child's own file. logging itself re-initialises the handler lock.
+    global _file, _listener, _listener_lock
+    _listener, _listener_lock = None, threading.Lock()
+    _file.close()
+    _file = _file_handler()
+    _queue_handler.queue = queue.SimpleQueue()
+    _start_listener()
 
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    format= "[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
 
-)
+_root = logging.getLogger()
+_root.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+_root.addHandler(_queue_handler)
+_start_listener()
+atexit.register(stop_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_in_parent,
+                        after_in_child=_after_fork_in_child)
@@ -0,0 +1,430 @@
+"""
+Portable artifact bundle: an alternative to dill-pickling the fitted model and preprocessor.
+
+Layout of a bundle directory:
+
+    manifest.json                            format version, library versions, per-file sha256,
+                                             and "root", the version directory it points to
+    versions/<id>/preprocessor/block<i>_*.npy  scaler constants, imputer values, encoder categories
+    versions/<id>/model/model.ubj | model.cbm  native XGBoost / CatBoost boosters
+    versions/<id>/model/coef.npy, intercept.npy  linear models
+    versions/<id>/model/model.pkl            dill fallback for estimators without a native format
+
+Numeric arrays are loaded with mmap_mode="r", so workers forked from one parent (or
+started on the same host) share the pages instead of holding private copies. Every
+save writes a new version directory and then swaps manifest.json atomically, so files
+a running server has memory-mapped are never rewritten in place; the oldest versions
+are pruned once keep_versions newer ones exist.
+
+    python -m src.pipeline.artifact_bundle --model artifacts/model.pkl \
+        --preprocessor artifacts/preprocessor.pkl --out artifacts/bundle
+"""
+import os
+import sys
+import json
+import shutil
+import hashlib
+import platform
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+VERSIONS_DIR = "versions"
+
+
+@dataclass
+class ArtifactBundle:
+    model: object
+    preprocessor: object
+    manifest: dict
+
+
+class LinearModelArrays:
+    """predict() of a fitted sklearn linear model from its coef_/intercept_ arrays."""
+
+    def __init__(self, coef, intercept, name="LinearModel"):
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.name = name
+
+    def predict(self, X):
+        return np.asarray(X) @ self.coef_.T + self.intercept_
+
+
+class BundlePreprocessor:
+    """
+    Numpy re-implementation of a fitted ColumnTransformer made of StandardScaler and
+    OneHotEncoder(handle_unknown="ignore") blocks, optionally preceded by a SimpleImputer.
+    Produces the same values as the sklearn object, always as a dense float64 array.
+    """
+
+    def __init__(self, feature_names_in, blocks):
+        self.feature_names_in_ = np.asarray(feature_names_in, dtype=object)
+        self.blocks = blocks
+        self.n_features_out_ = sum(
+            len(b["columns"]) if b["type"] == "scale" else sum(len(c) for c in b["categories"])
+            for b in blocks
+        )
+
+    def transform(self, X: pd.DataFrame) -> np.ndarray:
+        out = np.zeros((len(X), self.n_features_out_), dtype=np.float64)
+        offset = 0
+        for block in self.blocks:
+            if block["type"] == "scale":
+                values = X[block["columns"]].to_numpy(dtype=np.float64)  # always a fresh array
+                if block["impute"] is not None:
+                    missing = np.isnan(values)
+                    if missing.any():
+                        values[missing] = np.take(block["impute"], np.nonzero(missing)[1])
+                # Same operation order as StandardScaler.transform so results are bit-identical
+                values -= block["mean"]
+                values /= block["scale"]
+                width = values.shape[1]
+                out[:, offset:offset + width] = values
+                offset += width
+            else:
+                rows = np.arange(len(X))
+                for i, column in enumerate(block["columns"]):
+                    categories = block["categories"][i]
+                    values = X[column].to_numpy()
+                    if block["impute"] is not None:
+                        values = pd.Series(values).fillna(block["impute"][i]).to_numpy()
+                    if categories.dtype.kind in "iuf":
+                        values = pd.to_numeric(values, errors="coerce")
+                    else:
+                        values = values.astype(str)
+                    # Categories are sorted (OneHotEncoder sorts them), so searchsorted is a lookup
+                    idx = np.searchsorted(categories, values)
+                    idx = np.minimum(idx, len(categories) - 1)
+                    known = categories[idx] == values
+                    out[rows[known], offset + idx[known]] = 1.0
+                    offset += len(categories)
+        return out
+
+
+def _sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _library_versions():
+    versions = {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__}
+    for name in ("sklearn", "xgboost", "catboost", "dill"):
+        module = sys.modules.get(name)
+        if module is not None:
+            versions[name] = getattr(module, "__version__", None)
+    return versions
+
+
+def _split_step(transformer):
+    """Return (imputer or None, final step) for a bare transformer or Pipeline(imputer?, step)."""
+    from sklearn.pipeline import Pipeline
+    from sklearn.impute import SimpleImputer
+
+    if isinstance(transformer, Pipeline):
+        steps = [step for _, step in transformer.steps if step not in (None, "passthrough")]
+        if len(steps) == 2 and isinstance(steps[0], SimpleImputer):
+            return steps[0], steps[1]
+        if len(steps) == 1:
+            return None, steps[0]
+        return None, None
+    return None, transformer
+
+
+def _plain_categories(categories):
+    """Fixed-width string/number array (no object dtype) so categories can be memory-mapped."""
+    if categories.dtype != object:
+        return categories
+    values = categories.tolist()
+    if all(isinstance(v, str) for v in values):
+        return categories.astype(str)
+    # e.g. integer-coded columns routed through an object-dtype imputer
+    return np.asarray(values, dtype=np.float64)
+
+
+def preprocessor_blocks(preprocessor):
+    """
+    Describe a fitted preprocessor as a list of in-memory blocks, in output column order:
+    {"type": "scale", "columns", "mean", "scale", "impute"} or
+    {"type": "onehot", "columns", "categories", "impute"}.
+    Returns None when the preprocessor uses anything other than SimpleImputer,
+    StandardScaler and OneHotEncoder(handle_unknown="ignore") inside a ColumnTransformer.
+    """
+    if isinstance(preprocessor, BundlePreprocessor):
+        return preprocessor.blocks
+
+    from sklearn.compose import ColumnTransformer
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    if not isinstance(preprocessor, ColumnTransformer) or not hasattr(preprocessor, "transformers_"):
+        return None
+
+    blocks = []
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == "drop" or (name == "remainder" and len(columns) == 0):
+            continue
+        imputer, step = _split_step(transformer)
+        if imputer is not None and not (isinstance(imputer, SimpleImputer) and imputer.add_indicator is False):
+            return None
+        columns = list(columns)
+
+        if isinstance(step, StandardScaler):
+            n = len(columns)
+            blocks.append({
+                "type": "scale",
+                "columns": columns,
+                "mean": np.ascontiguousarray(step.mean_ if step.with_mean else np.zeros(n), dtype=np.float64),
+                "scale": np.ascontiguousarray(step.scale_ if step.with_std else np.ones(n), dtype=np.float64),
+                "impute": np.asarray(imputer.statistics_, dtype=np.float64) if imputer is not None else None,
+            })
+        elif isinstance(step, OneHotEncoder):
+            if step.handle_unknown != "ignore" or step.drop is not None or \
+                    getattr(step, "min_frequency", None) is not None or \
+                    getattr(step, "max_categories", None) is not None:
+                return None
+            blocks.append({
+                "type": "onehot",
+                "columns": columns,
+                "categories": [_plain_categories(c) for c in step.categories_],
+                "impute": [v.item() if hasattr(v, "item") else v for v in imputer.statistics_]
+                if imputer is not None else None,
+            })
+        else:
+            return None
+    return blocks
+
+
+def _export_preprocessor(preprocessor, out_dir):
+    """Write the preprocessor as numpy arrays; returns a manifest entry or None if unsupported."""
+    blocks = preprocessor_blocks(preprocessor)
+    if blocks is None:
+        return None
+
+    entries = []
+    for i, block in enumerate(blocks):
+        prefix = f"preprocessor/block{i}"
+        entry = {"type": block["type"], "columns": block["columns"]}
+        if block["type"] == "scale":
+            for key in ("mean", "scale", "impute"):
+                if block[key] is None:
+                    entry[key] = None
+                    continue
+                np.save(os.path.join(out_dir, f"{prefix}_{key}.npy"), block[key], allow_pickle=False)
+                entry[key] = f"{prefix}_{key}.npy"
+        else:
+            entry["categories"] = []
+            for j, categories in enumerate(block["categories"]):
+                np.save(os.path.join(out_dir, f"{prefix}_categories{j}.npy"), categories, allow_pickle=False)
+                entry["categories"].append(f"{prefix}_categories{j}.npy")
+            entry["impute"] = block["impute"]
+        entries.append(entry)
+
+    return {
+        "kind": "column_transformer",
+        "feature_names_in": [str(c) for c in preprocessor.feature_names_in_],
+        "blocks": entries,
+    }
+
+
+def _export_model(model, out_dir):
+    module = type(model).__module__.split(".")[0]
+    entry = {"class": type(model).__name__}
+    if module == "xgboost":
+        model.save_model(os.path.join(out_dir, "model", "model.ubj"))
+        entry.update(kind="xgboost", file="model/model.ubj")
+    elif module == "catboost":
+        model.save_model(os.path.join(out_dir, "model", "model.cbm"))
+        entry.update(kind="catboost", file="model/model.cbm")
+    elif type(model).__module__.startswith("sklearn.linear_model") and hasattr(model, "coef_"):
+        np.save(os.path.join(out_dir, "model", "coef.npy"), np.asarray(model.coef_, dtype=np.float64))
+        np.save(os.path.join(out_dir, "model", "intercept.npy"), np.asarray(model.intercept_, dtype=np.float64))
+        entry.update(kind="linear", coef="model/coef.npy", intercept="model/intercept.npy")
+    else:
+        _dump_pickle(model, os.path.join(out_dir, "model", "model.pkl"))
+        entry.update(kind="pickle", file="model/model.pkl")
+    return entry
+
+
+def _dump_pickle(obj, file_path):
+    import dill
+
+    with open(file_path, "wb") as f:
+        dill.dump(obj, f)
+
+
+def _prune_versions(out_dir, current, keep_versions):
+    """
+    Remove all but the newest keep_versions version directories, plus the
+    pre-versioning preprocessor/ and model/ directories. Readers of an older
+    manifest get keep_versions - 1 saves to reload before their files go; where
+    a file still in use cannot be removed (Windows), it is left for a later save.
+    """
+    versions_dir = os.path.join(out_dir, VERSIONS_DIR)
+    names = sorted(os.listdir(versions_dir))
+    stale = [name for name in names[:-max(1, keep_versions)] if name != current]
+    for path in [os.path.join(versions_dir, name) for name in stale] + \
+            [os.path.join(out_dir, legacy) for legacy in ("preprocessor", "model")]:
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def save_bundle(out_dir, model, preprocessor, keep_versions=3):
+    """
+    Write model + preprocessor as a new bundle version under out_dir/versions/
+    and point manifest.json at it. The manifest is replaced last and atomically,
+    so a reader never sees a half-written bundle, and files of the previous
+    versions (possibly memory-mapped by a server) are not touched.
+    """
+    try:
+        version = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')}-{os.getpid()}"
+        root = f"{VERSIONS_DIR}/{version}"
+        version_dir = os.path.join(out_dir, VERSIONS_DIR, version)
+        os.makedirs(os.path.join(version_dir, "preprocessor"))
+        os.makedirs(os.path.join(version_dir, "model"))
+
+        preprocessor_entry = _export_preprocessor(preprocessor, version_dir)
+        if preprocessor_entry is None:
+            logging.info(f"Preprocessor {type(preprocessor).__name__} has no array export, pickling it")
+            _dump_pickle(preprocessor, os.path.join(version_dir, "preprocessor", "preprocessor.pkl"))
+            preprocessor_entry = {"kind": "pickle", "file": "preprocessor/preprocessor.pkl"}
+        model_entry = _export_model(model, version_dir)
+
+        files = {}
+        for sub_dir in ("preprocessor", "model"):
+            for name in sorted(os.listdir(os.path.join(version_dir, sub_dir))):
+                rel_path = f"{sub_dir}/{name}"
+                files[rel_path] = _sha256(os.path.join(version_dir, rel_path))
+
+        manifest = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "root": root,
+            "versions": _library_versions(),
+            "preprocessor": preprocessor_entry,
+            "model": model_entry,
+            "files": files,
+        }
+        tmp_path = os.path.join(out_dir, f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(out_dir, MANIFEST_NAME))
+
+        _prune_versions(out_dir, version, keep_versions)
+        return manifest
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def _load_pickle(file_path):
+    from src.utils import load_object
+
+    return load_object(file_path)
+
+
+def _load_preprocessor(entry, bundle_dir):
+    if entry["kind"] == "pickle":
+        return _load_pickle(os.path.join(bundle_dir, entry["file"]))
+
+    def array(rel_path):
+        return np.load(os.path.join(bundle_dir, rel_path), mmap_mode="r", allow_pickle=False)
+
+    blocks = []
+    for block in entry["blocks"]:
+        if block["type"] == "scale":
+            blocks.append({
+                "type": "scale",
+                "columns": block["columns"],
+                "mean": array(block["mean"]),
+                "scale": array(block["scale"]),
+                "impute": array(block["impute"]) if block["impute"] else None,
+            })
+        else:
+            blocks.append({
+                "type": "onehot",
+                "columns": block["columns"],
+                "categories": [array(p) for p in block["categories"]],
+                "impute": block["impute"],
+            })
+    return BundlePreprocessor(entry["feature_names_in"], blocks)
+
+
+def _load_model(entry, bundle_dir):
+    kind = entry["kind"]
+    if kind == "xgboost":
+        from xgboost import XGBRegressor
+
+        model = XGBRegressor()
+        model.load_model(os.path.join(bundle_dir, entry["file"]))
+        return model
+    if kind == "catboost":
+        from catboost import CatBoostRegressor
+
+        model = CatBoostRegressor()
+        model.load_model(os.path.join(bundle_dir, entry["file"]))
+        return model
+    if kind == "linear":
+        coef = np.load(os.path.join(bundle_dir, entry["coef"]), mmap_mode="r")
+        intercept = np.load(os.path.join(bundle_dir, entry["intercept"]))
+        return LinearModelArrays(coef, intercept, name=entry["class"])
+    return _load_pickle(os.path.join(bundle_dir, entry["file"]))
+
+
+def load_bundle(bundle_path, verify=True) -> ArtifactBundle:
+    """Load a bundle from its directory or its manifest.json path."""
+    try:
+        bundle_dir = os.path.dirname(bundle_path) if bundle_path.endswith(MANIFEST_NAME) else bundle_path
+        with open(os.path.join(bundle_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format version {manifest.get('format_version')}")
+        # Bundles written before versioning keep their files next to the manifest
+        bundle_dir = os.path.join(bundle_dir, manifest.get("root", ""))
+        if verify:
+            for rel_path, expected in manifest["files"].items():
+                if _sha256(os.path.join(bundle_dir, rel_path)) != expected:
+                    raise ValueError(f"Checksum mismatch for {rel_path} in {bundle_dir}")
+
+        return ArtifactBundle(
+            model=_load_model(manifest["model"], bundle_dir),
+            preprocessor=_load_preprocessor(manifest["preprocessor"], bundle_dir),
+            manifest=manifest,
+        )
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from src.utils import load_object
+
+    parser = argparse.ArgumentParser(description="Convert pickled artifacts into a bundle")
+    parser.add_argument("--model", default=os.path.join("artifacts", "model.pkl"))
+    parser.add_argument("--preprocessor", default=os.path.join("artifacts", "preprocessor.pkl"))
+    parser.add_argument("--out", default=os.path.join("artifacts", "bundle"))
+    args = parser.parse_args()
+
+    manifest = save_bundle(args.out, load_object(args.model), load_object(args.preprocessor))
+    print(f"Wrote {args.out}: model={manifest['model']['kind']} preprocessor={manifest['preprocessor']['kind']}")
+
+    start = time.perf_counter()
+    load_object(args.model), load_object(args.preprocessor)
+    pickle_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    load_bundle(args.out)
+    print(f"Load time: pickles {pickle_seconds * 1000:.1f} ms, bundle {(time.perf_counter() - start) * 1000:.1f} ms")
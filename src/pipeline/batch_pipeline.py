@@ -0,0 +1,169 @@
+"""
+Offline batch scoring that streams CSV/Parquet input in chunks.
+
+    python -m src.pipeline.batch_pipeline students.csv predictions.csv --chunk-size 50000 --workers 4
+
+Each chunk goes through engineer_features -> preprocessor -> model and is appended
+to the output before the next chunks are read, so memory stays bounded by
+(2 * workers + 1) chunks whatever the input size. Output keeps the input columns
+plus a prediction column (or only the predictions with --predictions-only).
+"""
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.model_registry import get_registry
+from src.pipeline.predict_pipeline import PredictPipeline
+
+
+@dataclass
+class BatchPredictConfig:
+    chunk_size: int = 50_000
+    # Scoring processes; 1 scores in the current process
+    workers: int = 1
+    prediction_column: str = "prediction"
+    predictions_only: bool = False
+
+
+def _is_parquet(path) -> bool:
+    return str(path).lower().endswith((".parquet", ".pq"))
+
+
+def _read_chunks(input_path, chunk_size):
+    if _is_parquet(input_path):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet needs pyarrow (pip install pyarrow)") from e
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(input_path, chunksize=chunk_size)
+
+
+class _ChunkWriter:
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self._parquet_writer = None
+        self._header_written = False
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if _is_parquet(self.output_path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            frame.to_csv(self.output_path, mode="a" if self._header_written else "w",
+                         header=not self._header_written, index=False)
+            self._header_written = True
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+_worker_pipeline = None
+
+
+def _init_worker() -> None:
+    global _worker_pipeline
+    _worker_pipeline = PredictPipeline()
+    get_registry().warm()
+
+
+def _score_chunk(chunk: pd.DataFrame):
+    return _worker_pipeline.predict(chunk)
+
+
+class BatchPredictPipeline:
+    def __init__(self, config: BatchPredictConfig = None):
+        self.batch_config = config or BatchPredictConfig()
+
+    def _output_frame(self, chunk, preds):
+        if self.batch_config.predictions_only:
+            return pd.DataFrame({self.batch_config.prediction_column: preds})
+        chunk = chunk.copy(deep=False)
+        chunk[self.batch_config.prediction_column] = preds
+        return chunk
+
+    def run(self, input_path, output_path) -> dict:
+        try:
+            config = self.batch_config
+            # Loaded before the pool starts so forked workers share the parent's copy
+            get_registry().warm()
+            writer = _ChunkWriter(output_path)
+            rows = chunks = 0
+            start = time.perf_counter()
+
+            def emit(chunk, preds):
+                nonlocal rows, chunks
+                writer.write(self._output_frame(chunk, preds))
+                rows += len(chunk)
+                chunks += 1
+                elapsed = time.perf_counter() - start
+                logging.info(f"Scored chunk {chunks}: {rows} rows, {rows / elapsed:.0f} rows/s")
+
+            try:
+                if config.workers <= 1:
+                    pipeline = PredictPipeline()
+                    for chunk in _read_chunks(input_path, config.chunk_size):
+                        emit(chunk, pipeline.predict(chunk))
+                else:
+                    with ProcessPoolExecutor(config.workers, initializer=_init_worker) as pool:
+                        # Bounded window of in-flight chunks, drained in submission order
+                        pending = deque()
+                        for chunk in _read_chunks(input_path, config.chunk_size):
+                            pending.append((chunk, pool.submit(_score_chunk, chunk)))
+                            if len(pending) >= 2 * config.workers:
+                                done_chunk, future = pending.popleft()
+                                emit(done_chunk, future.result())
+                        while pending:
+                            done_chunk, future = pending.popleft()
+                            emit(done_chunk, future.result())
+            finally:
+                writer.close()
+
+            seconds = time.perf_counter() - start
+            return {
+                "rows": rows,
+                "chunks": chunks,
+                "seconds": seconds,
+                "rows_per_sec": rows / seconds if seconds else 0.0,
+            }
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream a CSV/Parquet file through the prediction pipeline")
+    parser.add_argument("input", help="Input .csv or .parquet with the 32 student columns")
+    parser.add_argument("output", help="Output .csv or .parquet")
+    parser.add_argument("--chunk-size", type=int, default=BatchPredictConfig.chunk_size)
+    parser.add_argument("--workers", type=int, default=BatchPredictConfig.workers)
+    parser.add_argument("--prediction-column", default=BatchPredictConfig.prediction_column)
+    parser.add_argument("--predictions-only", action="store_true")
+    args = parser.parse_args()
+
+    stats = BatchPredictPipeline(BatchPredictConfig(
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        prediction_column=args.prediction_column,
+        predictions_only=args.predictions_only,
+    )).run(args.input, args.output)
+    print(f"Scored {stats['rows']} rows in {stats['chunks']} chunks, "
+          f"{stats['seconds']:.2f}s ({stats['rows_per_sec']:.0f} rows/s)")
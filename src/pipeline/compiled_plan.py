@@ -0,0 +1,146 @@
+import threading
+
+import numpy as np
+
+from src.features.engineer import ENGINEERED_COLS, engineer_columns, engineer_record
+from src.pipeline.artifact_bundle import preprocessor_blocks
+
+
+def _is_missing(value) -> bool:
+    return value is None or value != value  # NaN is the only value not equal to itself
+
+
+class CompiledPlan:
+    """
+    Single-record preprocessing compiled from a fitted preprocessor.
+
+    engineer_features + imputers + StandardScaler + OneHotEncoder are replaced by
+    flat constants: one gather of the numeric inputs into a preallocated vector,
+    an in-place (x - mean) / scale over all scaled columns at once, and a
+    category -> output-index table for the one-hot part. No DataFrame is built.
+    Output is bit-identical to preprocessor.transform(engineer_features(df)).
+    """
+
+    def __init__(self, feature_names_in, blocks):
+        self.feature_names_in_ = list(feature_names_in)
+        self.n_features_out_ = 0
+
+        num_columns, num_positions, means, scales, imputes = [], [], [], [], []
+        self._categorical = []  # (column, {category: output index}, impute value or None)
+        for block in blocks:
+            if block["type"] == "scale":
+                n = len(block["columns"])
+                num_columns.extend(block["columns"])
+                num_positions.extend(range(self.n_features_out_, self.n_features_out_ + n))
+                means.append(np.asarray(block["mean"], dtype=np.float64))
+                scales.append(np.asarray(block["scale"], dtype=np.float64))
+                imputes.append(np.asarray(block["impute"], dtype=np.float64) if block["impute"] is not None
+                               else np.full(n, np.nan))
+                self.n_features_out_ += n
+            else:
+                for i, column in enumerate(block["columns"]):
+                    categories = np.asarray(block["categories"][i]).tolist()
+                    lookup = {category: self.n_features_out_ + k for k, category in enumerate(categories)}
+                    impute = block["impute"][i] if block["impute"] is not None else None
+                    self._categorical.append((column, lookup, impute))
+                    self.n_features_out_ += len(categories)
+
+        self._num_columns = num_columns
+        self._num_positions = np.asarray(num_positions, dtype=np.intp)
+        self._mean = np.concatenate(means) if means else np.zeros(0)
+        self._scale = np.concatenate(scales) if scales else np.ones(0)
+        self._num_impute = np.concatenate(imputes).tolist() if imputes else []
+        # Scaled columns usually form one contiguous run at the start of the output
+        contiguous = len(num_positions) > 0 and num_positions == list(range(num_positions[0], num_positions[0] + len(num_positions)))
+        self._num_slice = slice(num_positions[0], num_positions[0] + len(num_positions)) if contiguous else None
+
+        used = set(num_columns) | {column for column, _, _ in self._categorical}
+        self._needs_engineering = bool(used & set(ENGINEERED_COLS))
+        self._local = threading.local()
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor):
+        """Compile a fitted preprocessor; returns None if it has unsupported steps."""
+        blocks = preprocessor_blocks(preprocessor)
+        if blocks is None:
+            return None
+        return cls(getattr(preprocessor, "feature_names_in_", []), blocks)
+
+    def _fill(self, row, num_buf, record) -> None:
+        if self._needs_engineering:
+            record = {**record, **engineer_record(record)}
+
+        row.fill(0.0)
+        values = [record[column] for column in self._num_columns]
+        for i, value in enumerate(values):
+            if _is_missing(value):
+                values[i] = self._num_impute[i]
+        num_buf[:] = values
+        # Same operation order as StandardScaler.transform so results are bit-identical
+        np.subtract(num_buf, self._mean, out=num_buf)
+        np.divide(num_buf, self._scale, out=num_buf)
+        if self._num_slice is not None:
+            row[self._num_slice] = num_buf
+        else:
+            row[self._num_positions] = num_buf
+
+        for column, lookup, impute in self._categorical:
+            value = record[column]
+            if impute is not None and _is_missing(value):
+                value = impute
+            index = lookup.get(value)
+            if index is not None:
+                row[index] = 1.0
+
+    def transform_record(self, record) -> np.ndarray:
+        """
+        Transform one record into a (1, n_features_out_) array. The array is a
+        per-thread buffer reused by the next call, so consume it right away.
+        """
+        local = self._local
+        if not hasattr(local, "row"):
+            local.row = np.zeros((1, self.n_features_out_), dtype=np.float64)
+            local.num_buf = np.zeros(len(self._num_columns), dtype=np.float64)
+        self._fill(local.row[0], local.num_buf, record)
+        return local.row
+
+    def transform_records(self, records) -> np.ndarray:
+        """Transform a list of records into a new (n, n_features_out_) array."""
+        out = np.zeros((len(records), self.n_features_out_), dtype=np.float64)
+        num_buf = np.zeros(len(self._num_columns), dtype=np.float64)
+        for i, record in enumerate(records):
+            self._fill(out[i], num_buf, record)
+        return out
+
+    def transform_columns(self, columns, n_rows: int) -> np.ndarray:
+        """
+        Vectorized transform of columnar input (mapping of column -> 1-D array,
+        e.g. CustomDataBatch.columns) into a new (n_rows, n_features_out_) array.
+        """
+        if self._needs_engineering:
+            columns = {**columns, **engineer_columns(columns)}
+
+        out = np.zeros((n_rows, self.n_features_out_), dtype=np.float64)
+        num = np.empty((n_rows, len(self._num_columns)), dtype=np.float64)
+        for j, column in enumerate(self._num_columns):
+            num[:, j] = columns[column]
+            if self._num_impute[j] == self._num_impute[j]:  # imputer fitted for this column
+                missing = np.isnan(num[:, j])
+                if missing.any():
+                    num[missing, j] = self._num_impute[j]
+        np.subtract(num, self._mean, out=num)
+        np.divide(num, self._scale, out=num)
+        if self._num_slice is not None:
+            out[:, self._num_slice] = num
+        else:
+            out[:, self._num_positions] = num
+
+        rows = np.arange(n_rows)
+        for column, lookup, impute in self._categorical:
+            values = columns[column]
+            if impute is not None:
+                values = [impute if _is_missing(v) else v for v in values]
+            index = np.fromiter((lookup.get(v, -1) for v in values), dtype=np.intp, count=n_rows)
+            known = index >= 0
+            out[rows[known], index[known]] = 1.0
+        return out
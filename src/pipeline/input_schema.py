@@ -0,0 +1,76 @@
+"""
+Fast validation of request inputs against the input schema written at
+ingestion (see src.features.schema). Batch validation is vectorized per column;
+only failing rows are materialized.
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.features.schema import SchemaConfig
+
+
+@dataclass
+class InputSchemaConfig:
+    schema_file_path: str = SchemaConfig.schema_file_path
+    enabled: bool = field(default_factory=lambda: os.environ.get("VALIDATE_INPUTS", "1") != "0")
+
+
+class InputSchema:
+    def __init__(self, schema: dict):
+        self.schema = schema
+        self._categories = {name: set(values) for name, values in schema.get("categorical", {}).items()}
+        self._category_arrays = {name: np.asarray(values, dtype=object)
+                                 for name, values in schema.get("categorical", {}).items()}
+        self._ranges = {name: (bounds["min"], bounds["max"]) for name, bounds in schema.get("numeric", {}).items()}
+
+    def _category_error(self, name, value) -> str:
+        return f"unknown category {value!r}, expected one of {sorted(self._categories[name])}"
+
+    def _range_error(self, name, value) -> str:
+        low, high = self._ranges[name]
+        return f"{value!r} outside [{low:g}, {high:g}]"
+
+    def validate_record(self, record: dict) -> Dict[str, str]:
+        """Errors of one record as {field: message}; empty if it is valid."""
+        errors = {}
+        for name, allowed in self._categories.items():
+            value = record.get(name)
+            if value not in allowed:
+                errors[name] = self._category_error(name, value)
+        for name, (low, high) in self._ranges.items():
+            value = record.get(name)
+            if value is None or not low <= value <= high:  # NaN fails both comparisons
+                errors[name] = self._range_error(name, value)
+        return errors
+
+    def validate_columns(self, columns, n_rows: int) -> List[dict]:
+        """
+        Validate columnar input (mapping of field -> 1-D array, e.g. CustomDataBatch.columns).
+        Returns [{"row": i, "errors": {field: message}}] for the failing rows only.
+        """
+        failures = {}  # field -> indices of failing rows
+        for name, allowed in self._category_arrays.items():
+            # Hash-based membership; np.isin sorts object arrays and is ~1.5x slower here
+            bad = ~pd.Series(columns[name], copy=False).isin(allowed).to_numpy()
+            if bad.any():
+                failures[name] = np.flatnonzero(bad)
+        for name, (low, high) in self._ranges.items():
+            values = np.asarray(columns[name], dtype=np.float64)
+            bad = ~((values >= low) & (values <= high))
+            if bad.any():
+                failures[name] = np.flatnonzero(bad)
+        if not failures:
+            return []
+
+        rows: Dict[int, Dict[str, str]] = {}
+        for name, indices in failures.items():
+            values = columns[name]
+            describe = self._category_error if name in self._categories else self._range_error
+            for i in indices.tolist():
+                value = values[i]
+                rows.setdefault(i, {})[name] = describe(name, value.item() if hasattr(value, "item") else value)
+        return [{"row": i, "errors": rows[i]} for i in sorted(rows)]
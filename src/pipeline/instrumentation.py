@@ -0,0 +1,186 @@
+"""
+Low-overhead runtime metrics rendered in the Prometheus text format.
+
+    with timed_stage("model_predict"):
+        preds = model.predict(X)
+
+Histograms keep cumulative bucket counts per label set (one bisect and two adds
+per observation); gauges are callbacks evaluated only when /metrics/prometheus
+is scraped. Metrics are per process: with several gunicorn workers each worker
+reports its own values.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Tuple
+
+from src.utils import peak_memory_bytes, resident_memory_bytes
+
+# Seconds; tuned for 10us stages up to multi-second batches
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{str(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._series.items()}
+        for labelvalues, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _labels(self.labelnames + ("le",), labelvalues + (le,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return "\n".join(lines)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for labelvalues, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {value}")
+        return "\n".join(lines)
+
+
+class Gauge:
+    """Value read from a callback at scrape time (or set/inc/dec directly)."""
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float] = None, kind: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.kind = kind
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def render(self) -> str:
+        try:
+            value = self.callback() if self.callback is not None else self.value
+        except Exception:
+            return ""  # source not available (e.g. artifacts not loaded yet)
+        return f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n{self.name} {float(value)}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        parts = [metric.render() for metric in self._metrics.values()]
+        return "\n".join(part for part in parts if part) + "\n"
+
+
+metrics = MetricsRegistry()
+STAGE_SECONDS = metrics.register(Histogram(
+    "prediction_stage_seconds", "Time spent in each stage of the prediction path.", ["stage"]))
+metrics.register(Gauge("process_resident_memory_bytes", "Resident memory size in bytes.", resident_memory_bytes))
+metrics.register(Gauge("process_max_resident_memory_bytes", "Peak resident memory size in bytes.", peak_memory_bytes))
+_process_start = time.time()
+metrics.register(Gauge("process_start_time_seconds", "Start time of the process since the epoch.",
+                       lambda: _process_start))
+
+
+@contextmanager
+def timed_stage(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage)
+
+
+IN_FLIGHT = metrics.register(Gauge("http_requests_in_flight", "Requests currently being served."))
+HTTP_SECONDS = metrics.register(Histogram(
+    "http_request_duration_seconds", "End-to-end request latency.", ["handler"]))
+HTTP_REQUESTS = metrics.register(Counter("http_requests_total", "Requests served.", ["handler", "status"]))
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware overhead): in-flight gauge,
+    latency histogram and status counter per handler. Handlers are labelled by
+    endpoint name, so unknown URLs do not create new series. It also stores the
+    arrival time in scope["state"]["received_at"] for the parsing stage.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        scope.setdefault("state", {})["received_at"] = start
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            endpoint = scope.get("endpoint")
+            handler = getattr(endpoint, "__name__", "unmatched") if endpoint is not None else "unmatched"
+            HTTP_SECONDS.observe(time.perf_counter() - start, handler)
+            HTTP_REQUESTS.inc(handler, str(status["code"]))
@@ -0,0 +1,155 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence
+
+from src.logger import logging
+
+
+@dataclass
+class MicroBatcherConfig:
+    # A batch is closed when it reaches max_batch_rows or max_wait_ms after its first request
+    max_batch_rows: int = field(default_factory=lambda: int(os.environ.get("PREDICT_MAX_BATCH_ROWS", "64")))
+    max_wait_ms: float = field(default_factory=lambda: float(os.environ.get("PREDICT_BATCH_WINDOW_MS", "2")))
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-record prediction requests into small batches.
+
+    Requests wait on an asyncio queue; a background task closes a batch after
+    max_wait_ms or max_batch_rows, runs one vectorized predict_fn(records) in a
+    worker thread (so the event loop keeps serving health checks) and resolves
+    each request's future with its own prediction. If the batch call raises,
+    its records are retried one by one, so a bad record only fails its own
+    request. Requests still queued when the batcher stops fail with
+    RuntimeError.
+    """
+
+    def __init__(self, predict_fn: Callable[[List[dict]], Sequence[float]],
+                 config: Optional[MicroBatcherConfig] = None):
+        self.predict_fn = predict_fn
+        self.batcher_config = config or MicroBatcherConfig()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._batch: list = []  # (record, future) pairs taken off the queue and not resolved yet
+        self.batches = 0
+        self.rows = 0
+        self.max_batch_size = 0
+        self.errors = 0
+        # Batch size histogram, buckets are upper bounds
+        self.batch_size_buckets = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+        self.batch_size_counts = [0] * (len(self.batch_size_buckets) + 1)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batch")
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        pending = self._batch
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction batcher stopped before the request was served"))
+        self._batch = []
+
+    async def submit(self, record: dict) -> float:
+        if self._task is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        return await future
+
+    async def _collect(self, batch: list) -> list:
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.batcher_config.max_wait_ms / 1000
+        while len(batch) < self.batcher_config.max_batch_rows:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _record_batch(self, size: int) -> None:
+        self.batches += 1
+        self.rows += size
+        self.max_batch_size = max(self.max_batch_size, size)
+        for i, bound in enumerate(self.batch_size_buckets):
+            if size <= bound:
+                self.batch_size_counts[i] += 1
+                break
+        else:
+            self.batch_size_counts[-1] += 1
+
+    def _predict_each(self, records: List[dict]) -> list:
+        """Per-record fallback after a failed batch: a prediction or the exception for each record."""
+        outcomes = []
+        for record in records:
+            try:
+                outcomes.append(self.predict_fn([record])[0])
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = []
+            batch = await self._collect(self._batch)
+            self._record_batch(len(batch))
+            records = [r for r, _ in batch]
+            try:
+                outcomes = await loop.run_in_executor(self._executor, self.predict_fn, records)
+            except Exception as e:
+                self.errors += 1
+                logging.info(f"Micro-batch of {len(batch)} failed ({e}), retrying record by record")
+                outcomes = [e] if len(batch) == 1 else \
+                    await loop.run_in_executor(self._executor, self._predict_each, records)
+            for (_, future), outcome in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(float(outcome))
+            self._batch = []
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "errors": self.errors,
+            "batch_size_histogram": {
+                **{f"<={b}": c for b, c in zip(self.batch_size_buckets, self.batch_size_counts)},
+                f">{self.batch_size_buckets[-1]}": self.batch_size_counts[-1],
+            },
+            "max_batch_rows": self.batcher_config.max_batch_rows,
+            "max_wait_ms": self.batcher_config.max_wait_ms,
+        }
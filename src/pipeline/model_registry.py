@@ -0,0 +1,254 @@
+import os
+import sys
+import json
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import load_object
+from src.pipeline.artifact_bundle import MANIFEST_NAME, load_bundle
+
+
+@dataclass
+class ModelRegistryConfig:
+    model_file_path: str = os.path.join("artifacts", "model.pkl")
+    preprocessor_file_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    metrics_file_path: str = os.path.join("artifacts", "metrics.json")
+    bundle_dir: str = os.path.join("artifacts", "bundle")
+    # "pickle" serves model.pkl/preprocessor.pkl, "bundle" serves the artifact bundle in bundle_dir
+    artifact_format: str = field(default_factory=lambda: os.environ.get("ARTIFACT_FORMAT", "pickle"))
+    # Artifact files are stat'ed at most once per interval (seconds); 0 checks on every access and a
+    # negative value turns the file watch off (gunicorn reloads through HUP -> refresh() instead)
+    check_interval: float = field(default_factory=lambda: float(os.environ.get("ARTIFACT_CHECK_INTERVAL", "1.0")))
+
+
+@dataclass
+class ArtifactEntry:
+    path: str
+    obj: Any
+    mtime_ns: int
+    size: int
+    sha256: str
+    load_seconds: float
+    loaded_at: float
+    checked_at: float = field(default=0.0)
+    # Set by refresh(): the next access stats the file whatever check_interval says
+    stale: bool = field(default=False)
+
+
+@dataclass(frozen=True)
+class ModelMetadata:
+    version: str
+    model_name: str
+    metrics: dict
+    trained_at: Optional[str]
+    features: List[str]
+
+
+def load_json(file_path: str) -> dict:
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def file_sha256(file_path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_obj:
+        for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of deserialized artifacts (model, preprocessor, ...).
+
+    Objects are loaded once and handed out as shared handles, so callers must
+    treat them as read-only. An artifact is reloaded only when its file changes:
+    a new mtime/size triggers a content hash, and the object is deserialized
+    again only if the hash differs from the loaded one.
+    """
+
+    def __init__(self, config: Optional[ModelRegistryConfig] = None):
+        self.registry_config = config or ModelRegistryConfig()
+        self._entries: Dict[str, ArtifactEntry] = {}
+        self._lock = threading.RLock()
+        # Hits are mostly counted on the lock-free fast path, so they get their own (short) lock
+        self._hits_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self._metadata: Optional[ModelMetadata] = None
+        self._metadata_key = None
+
+    def get(self, file_path, loader: Callable[[str], Any] = load_object):
+        try:
+            key = os.path.abspath(str(file_path))
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            interval = self.registry_config.check_interval
+            if entry is not None and not entry.stale and (interval < 0 or now - entry.checked_at < interval):
+                self._count_hit()
+                return entry.obj
+
+            stat = os.stat(key)
+            if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                entry.checked_at, entry.stale = now, False
+                self._count_hit()
+                return entry.obj
+
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                    entry.checked_at, entry.stale = now, False
+                    self._count_hit()
+                    return entry.obj
+
+                digest = file_sha256(key)
+                if entry is not None and entry.sha256 == digest:
+                    # File was touched or rewritten with identical content: keep the loaded object
+                    entry.mtime_ns, entry.size, entry.checked_at = stat.st_mtime_ns, stat.st_size, now
+                    entry.stale = False
+                    self._count_hit()
+                    return entry.obj
+
+                self.misses += 1
+                start = time.perf_counter()
+                obj = loader(key)
+                load_seconds = time.perf_counter() - start
+                if entry is not None:
+                    self.reloads += 1
+                    logging.info(f"Artifact changed on disk, reloaded {key} in {load_seconds:.3f}s")
+                else:
+                    logging.info(f"Loaded artifact {key} in {load_seconds:.3f}s")
+
+                self._entries[key] = ArtifactEntry(
+                    path=key,
+                    obj=obj,
+                    mtime_ns=stat.st_mtime_ns,
+                    size=stat.st_size,
+                    sha256=digest,
+                    load_seconds=load_seconds,
+                    loaded_at=time.time(),
+                    checked_at=now,
+                )
+                return obj
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _count_hit(self) -> None:
+        with self._hits_lock:
+            self.hits += 1
+
+    def refresh(self) -> None:
+        """Make the next access of every loaded artifact check its file, even with the file watch off."""
+        with self._lock:
+            for entry in self._entries.values():
+                entry.stale = True
+
+    def _artifact_paths(self) -> List[str]:
+        """Files whose content defines the served model version."""
+        if self.registry_config.artifact_format == "bundle":
+            return [os.path.join(self.registry_config.bundle_dir, MANIFEST_NAME)]
+        return [self.registry_config.model_file_path, self.registry_config.preprocessor_file_path]
+
+    def bundle(self):
+        return self.get(os.path.join(self.registry_config.bundle_dir, MANIFEST_NAME), loader=load_bundle)
+
+    def model(self):
+        if self.registry_config.artifact_format == "bundle":
+            return self.bundle().model
+        return self.get(self.registry_config.model_file_path)
+
+    def preprocessor(self):
+        if self.registry_config.artifact_format == "bundle":
+            return self.bundle().preprocessor
+        return self.get(self.registry_config.preprocessor_file_path)
+
+    def warm(self) -> None:
+        self.model()
+        self.preprocessor()
+
+    def metrics(self) -> dict:
+        if not os.path.exists(self.registry_config.metrics_file_path):
+            return {}
+        return self.get(self.registry_config.metrics_file_path, loader=load_json)
+
+    def metadata(self) -> ModelMetadata:
+        """
+        Model class, training metrics, training timestamp and input features.
+
+        Computed once per artifact version: keyed on the content hashes of the
+        model, preprocessor and metrics files, so a missing metrics.json does
+        not invalidate it on every call.
+        """
+        model = self.model()
+        preprocessor = self.preprocessor()
+        metrics = self.metrics()
+        metrics_entry = self._entries.get(os.path.abspath(str(self.registry_config.metrics_file_path)))
+        key = (self.version(), metrics_entry.sha256 if metrics and metrics_entry is not None else None)
+        metadata = self._metadata
+        if metadata is not None and self._metadata_key == key:
+            return metadata
+
+        model_name = type(model).__name__
+        trained_at = metrics.get("trained_at")
+        if self.registry_config.artifact_format == "bundle":
+            manifest = self.bundle().manifest
+            model_name = manifest["model"]["class"]
+            trained_at = trained_at or manifest.get("created_at")
+        if trained_at is None:
+            model_entry = self._entries[os.path.abspath(str(self._artifact_paths()[0]))]
+            trained_at = datetime.fromtimestamp(model_entry.mtime_ns / 1e9, tz=timezone.utc).isoformat()
+
+        metadata = ModelMetadata(
+            version=self.version(),
+            model_name=model_name,
+            metrics=metrics,
+            trained_at=trained_at,
+            features=[str(c) for c in getattr(preprocessor, "feature_names_in_", [])],
+        )
+        self._metadata, self._metadata_key = metadata, key
+        return metadata
+
+    def version(self) -> str:
+        """Short identifier of the currently loaded model + preprocessor pair."""
+        self.warm()
+        digests = [self._entries[os.path.abspath(str(path))].sha256 for path in self._artifact_paths()]
+        return hashlib.sha256("".join(digests).encode()).hexdigest()[:12]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "artifacts": {
+                entry.path: {
+                    "sha256": entry.sha256,
+                    "size": entry.size,
+                    "load_seconds": entry.load_seconds,
+                    "loaded_at": entry.loaded_at,
+                }
+                for entry in list(self._entries.values())
+            },
+        }
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
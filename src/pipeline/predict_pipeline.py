@@ -1,34 +1,99 @@
 import sys
+import json
+import numpy as np
 import pandas as pd
-from pathlib import Path
 from src.exception import CustomException
-from src.utils import load_object
 from src.features.engineer import engineer_features
+from src.features.schema import CUSTOM_DATA_FIELDS
+from src.pipeline.model_registry import ModelRegistry, get_registry
+from src.pipeline.compiled_plan import CompiledPlan
+from src.pipeline.instrumentation import timed_stage
 
 
 class PredictPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, registry: ModelRegistry = None):
+        # Artifacts are shared through the process-wide registry instead of being unpickled per call
+        self.registry = registry or get_registry()
+        self._plan = None
+        self._plan_source = None
     
 
     def predict(self, features):
         try:
-            model_path = Path("artifacts") / "model.pkl"
-            preprocessor_path = Path("artifacts") / "preprocessor.pkl"
-            model = load_object(file_path=model_path)
-            preprocessor = load_object(file_path=preprocessor_path)
+            model = self.registry.model()
+            preprocessor = self.registry.preprocessor()
             # Add engineered features expected by the preprocessor/model
-            features_fe = engineer_features(features)
-            data_scaled = preprocessor.transform(features_fe)
-            preds = model.predict(data_scaled)
+            with timed_stage("engineer_features"):
+                features_fe = engineer_features(features, compact=True)
+            with timed_stage("preprocessor_transform"):
+                data_scaled = preprocessor.transform(features_fe)
+            with timed_stage("model_predict"):
+                preds = model.predict(data_scaled)
             return preds
 
         except Exception as e:
             raise CustomException(e,sys)
-        
 
-        
+    def compiled_plan(self, preprocessor):
+        # Recompiled only when the registry hands out a different (reloaded) preprocessor
+        if self._plan_source is not preprocessor:
+            self._plan = CompiledPlan.from_preprocessor(preprocessor)
+            self._plan_source = preprocessor
+        return self._plan
+
+    def predict_record(self, record: dict) -> float:
+        """Score a single record (column -> value) without building a DataFrame."""
+        try:
+            model = self.registry.model()
+            preprocessor = self.registry.preprocessor()
+            plan = self.compiled_plan(preprocessor)
+            if plan is None:
+                return float(self.predict(pd.DataFrame([record]))[0])
+            with timed_stage("plan_transform"):
+                X = plan.transform_record(record)
+            with timed_stage("model_predict"):
+                return float(model.predict(X)[0])
+
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def predict_records(self, records):
+        """Score a list of records in one vectorized model call (used by the micro-batcher)."""
+        try:
+            model = self.registry.model()
+            preprocessor = self.registry.preprocessor()
+            plan = self.compiled_plan(preprocessor)
+            if plan is None:
+                return self.predict(pd.DataFrame(records))
+            with timed_stage("plan_transform"):
+                X = plan.transform_records(records)
+            with timed_stage("model_predict"):
+                return model.predict(X)
+
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def predict_batch(self, batch: "CustomDataBatch"):
+        """Score a columnar batch without building a DataFrame when the plan supports it."""
+        try:
+            model = self.registry.model()
+            preprocessor = self.registry.preprocessor()
+            plan = self.compiled_plan(preprocessor)
+            if plan is None:
+                return self.predict(batch.to_dataframe())
+            with timed_stage("plan_transform"):
+                X = plan.transform_columns(batch.columns, len(batch))
+            with timed_stage("model_predict"):
+                return model.predict(X)
+
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
 class CustomData:
+    # Fixed attribute slots instead of a per-instance __dict__
+    __slots__ = tuple(CUSTOM_DATA_FIELDS)
+
     def __init__(self,
                  school: str,
                  sex: str,
@@ -95,43 +160,83 @@ class CustomData:
         self.absences = absences
         self.G1 = G1
         self.G2 = G2
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
     def to_dataframe(self):
         try:
-            data_dict = {
-                "school": [self.school],
-                "sex": [self.sex],
-                "age": [self.age],
-                "address": [self.address],
-                "famsize": [self.famsize],
-                "Pstatus": [self.Pstatus],
-                "Medu": [self.Medu],
-                "Fedu": [self.Fedu],
-                "Mjob": [self.Mjob],
-                "Fjob": [self.Fjob],
-                "reason": [self.reason],
-                "guardian": [self.guardian],
-                "traveltime": [self.traveltime],
-                "studytime": [self.studytime],
-                "failures": [self.failures],
-                "schoolsup": [self.schoolsup],
-                "famsup": [self.famsup],
-                "paid": [self.paid],
-                "activities": [self.activities],
-                "nursery": [self.nursery],
-                "higher": [self.higher],
-                "internet": [self.internet],
-                "romantic": [self.romantic],
-                "famrel": [self.famrel],
-                "freetime": [self.freetime],
-                "goout": [self.goout],
-                "Dalc": [self.Dalc],
-                "Walc": [self.Walc],
-                "health": [self.health],
-                "absences": [self.absences],
-                "G1": [self.G1],
-                "G2": [self.G2]
-                }
-            return pd.DataFrame(data_dict)
-        
+            with timed_stage("to_dataframe"):
+                return CustomDataBatch.from_records([self]).to_dataframe()
+
         except Exception as e:
             raise CustomException(e, sys)
+
+
+class CustomDataBatch:
+    """
+    Columnar container of many CustomData rows: one numpy array per field.
+    Numeric fields are int64, or float64 when any value is not a whole number
+    (e.g. absences=4.5), as pandas infers for a column of Python values;
+    categorical fields are object arrays.
+
+    The arrays are what CompiledPlan.transform_columns consumes directly, and
+    to_dataframe wraps them without copying.
+    """
+
+    __slots__ = ("columns", "n_rows")
+
+    def __init__(self, columns: dict):
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        self.columns = columns
+        self.n_rows = lengths.pop() if lengths else 0
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from CustomData objects, mappings or any objects with the field attributes."""
+        try:
+            records = list(records)
+            n = len(records)
+            columns = {}
+            for name, kind in CUSTOM_DATA_FIELDS.items():
+                if records and isinstance(records[0], dict):
+                    values = (record[name] for record in records)
+                else:
+                    values = (getattr(record, name) for record in records)
+                if kind is int:
+                    column = np.fromiter(values, dtype=np.float64, count=n)
+                    if np.isfinite(column).all() and (column == np.trunc(column)).all():
+                        column = column.astype(np.int64)
+                    columns[name] = column
+                else:
+                    column = np.empty(n, dtype=object)
+                    column[:] = list(values)
+                    columns[name] = column
+            return cls(columns)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @classmethod
+    def from_json(cls, payload):
+        """Build from a JSON list of records or an object with a "records" list."""
+        try:
+            data = json.loads(payload)
+            if isinstance(data, dict):
+                data = data["records"]
+            return cls.from_records(data)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        # copy=False keeps each column backed by its original array
+        return pd.DataFrame(self.columns, columns=list(CUSTOM_DATA_FIELDS), copy=False)
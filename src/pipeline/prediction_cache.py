@@ -0,0 +1,114 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+@dataclass
+class PredictionCacheConfig:
+    # 0 disables the cache
+    max_entries: int = field(default_factory=lambda: int(os.environ.get("PREDICT_CACHE_SIZE", "10000")))
+    ttl_seconds: float = field(default_factory=lambda: float(os.environ.get("PREDICT_CACHE_TTL", "3600")))
+
+
+def _canonical(value):
+    """Normalize a field value so equivalent form/JSON inputs hash the same ("5", 5, 5.0 -> 5)."""
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            value = float(value)
+        except ValueError:
+            return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def record_key(record: dict, version: str) -> bytes:
+    """Digest of the canonicalized record fields plus the model version."""
+    canonical = sorted((str(k), _canonical(v)) for k, v in record.items())
+    return hashlib.blake2b(repr((version, canonical)).encode(), digest_size=16).digest()
+
+
+class PredictionCache:
+    """
+    LRU + TTL cache of single-record predictions.
+
+    Keys include the registry version, so a newly deployed model never serves
+    predictions of the previous one; stale entries simply age out of the LRU.
+    """
+
+    def __init__(self, version_fn: Callable[[], str], config: Optional[PredictionCacheConfig] = None):
+        self.version_fn = version_fn
+        self.cache_config = config or PredictionCacheConfig()
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()  # key -> (prediction, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache_config.max_entries > 0
+
+    def key(self, record: dict) -> bytes:
+        return record_key(record, self.version_fn())
+
+    def get(self, key: bytes) -> Optional[float]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            prediction, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return prediction
+
+    def put(self, key: bytes, prediction: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (float(prediction), time.monotonic() + self.cache_config.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.cache_config.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def memory_bytes(self) -> int:
+        """Approximate footprint: the dict itself plus key, tuple and float objects per entry."""
+        with self._lock:
+            n = len(self._entries)
+            if not n:
+                return sys.getsizeof(self._entries)
+            key, entry = next(iter(self._entries.items()))
+            per_entry = sys.getsizeof(key) + sys.getsizeof(entry) + sum(sys.getsizeof(v) for v in entry)
+            return sys.getsizeof(self._entries) + n * per_entry
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.cache_config.max_entries,
+            "ttl_seconds": self.cache_config.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "memory_bytes": self.memory_bytes(),
+        }
@@ -0,0 +1,207 @@
+"""
+Structured prediction log: one JSON line per prediction with the input features,
+the prediction, the model version and stage timings.
+
+Request handlers only enqueue (never block on disk); a background thread
+serializes, buffers and appends to <log_dir>/predictions.<pid>.jsonl and rotates
+it by size into predictions-<timestamp>.<pid>.jsonl(.gz). Every process (e.g.
+each gunicorn worker) writes and rotates its own file, and hands it over as a
+rotated file when it closes; pruning to backup_count only ever touches rotated
+files. Lines can be replayed against the API or aggregated for drift monitoring.
+"""
+import gzip
+import json
+import os
+import queue
+import random
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+
+from src.logger import logging
+
+
+@dataclass
+class PredictionLogConfig:
+    enabled: bool = field(default_factory=lambda: os.environ.get("PREDICTION_LOG", "1") != "0")
+    log_dir: str = field(default_factory=lambda: os.environ.get("PREDICTION_LOG_DIR", os.path.join("logs", "predictions")))
+    # Fraction of predictions written (per row for batches)
+    sample_rate: float = field(default_factory=lambda: float(os.environ.get("PREDICTION_LOG_SAMPLE_RATE", "1.0")))
+    compress: bool = field(default_factory=lambda: os.environ.get("PREDICTION_LOG_COMPRESS", "1") != "0")
+    max_bytes: int = 50 * 1024 * 1024
+    backup_count: int = 20
+    flush_interval: float = 1.0
+    # Rows waiting to be written (a batch counts all its rows); beyond this new
+    # entries are dropped rather than blocking requests or growing memory
+    max_pending_rows: int = 100_000
+
+
+def _jsonable(value):
+    value = value.item() if isinstance(value, np.generic) else value
+    # Float batch columns: write whole numbers back as ints
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+class PredictionLogWriter:
+    def __init__(self, config: Optional[PredictionLogConfig] = None):
+        self.log_config = config or PredictionLogConfig()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._pending_rows = 0
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+
+    @property
+    def path(self) -> str:
+        # Resolved on every access so a writer inherited through fork uses the child's pid
+        return os.path.join(self.log_config.log_dir, f"predictions.{os.getpid()}.jsonl")
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None and self.log_config.enabled:
+                self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+                self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending entries and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _enqueue(self, item, rows: int) -> None:
+        if self._thread is None:
+            self.start()
+        with self._lock:
+            if self._pending_rows + rows > self.log_config.max_pending_rows:
+                self.dropped += rows
+                return
+            self._pending_rows += rows
+        self._queue.put(item)
+
+    def log(self, features: dict, prediction: float, model_version: str, timings_ms: dict, **extra) -> None:
+        """Record one prediction (subject to sampling)."""
+        config = self.log_config
+        if not config.enabled or (config.sample_rate < 1.0 and random.random() >= config.sample_rate):
+            return
+        self._enqueue(("one", time.time(), features, prediction, model_version, timings_ms, extra), 1)
+
+    def log_batch(self, columns, predictions, model_version: str, timings_ms: dict, **extra) -> None:
+        """Record a batch (mapping of field -> array plus predictions); rows are expanded and sampled off-thread."""
+        if not self.log_config.enabled:
+            return
+        self._enqueue(("batch", time.time(), columns, predictions, model_version, timings_ms, extra),
+                      len(predictions))
+
+    def _lines(self, item):
+        kind, ts, features, prediction, version, timings, extra = item
+        base = {"ts": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(), "model_version": version,
+                "timings_ms": timings, **extra}
+        if kind == "one":
+            yield json.dumps({**base, "features": features, "prediction": float(prediction)}, default=_jsonable)
+            return
+        n = len(prediction)
+        rows = np.arange(n)
+        if self.log_config.sample_rate < 1.0:
+            rows = np.flatnonzero(np.random.random(n) < self.log_config.sample_rate)
+        names = list(features)
+        for i in rows.tolist():
+            record = {name: _jsonable(features[name][i]) for name in names}
+            yield json.dumps({**base, "row": i, "features": record, "prediction": float(prediction[i])},
+                             default=_jsonable)
+
+    def _open(self):
+        os.makedirs(self.log_config.log_dir, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _rotate(self, reopen: bool = True) -> None:
+        path = self._file.name
+        self._file.close()
+        self._file = None
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        rotated = os.path.join(self.log_config.log_dir, f"predictions-{stamp}.{os.getpid()}.jsonl")
+        os.replace(path, rotated)
+        if self.log_config.compress:
+            # Written under a temporary name so pruning in another process never sees a partial .gz
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz.tmp", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(rotated + ".gz.tmp", rotated + ".gz")
+            os.remove(rotated)
+        self.rotations += 1
+        suffix = ".jsonl.gz" if self.log_config.compress else ".jsonl"
+        old = sorted(f for f in os.listdir(self.log_config.log_dir) if f.startswith("predictions-") and f.endswith(suffix))
+        for name in old[:max(len(old) - self.log_config.backup_count, 0)]:
+            try:
+                os.remove(os.path.join(self.log_config.log_dir, name))
+            except FileNotFoundError:
+                pass  # pruned by another process
+        if reopen:
+            self._open()
+
+    def _write(self, lines) -> None:
+        if self._file is None:
+            self._open()
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        self.written += len(lines)
+        if self._file.tell() >= self.log_config.max_bytes:
+            self._rotate()
+
+    def _run(self) -> None:
+        buffer = []
+        deadline = time.monotonic() + self.log_config.flush_interval
+        stop = False
+        while not stop:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.01))
+                if item is None:
+                    stop = True
+                else:
+                    try:
+                        buffer.extend(self._lines(item))
+                    finally:
+                        with self._lock:
+                            self._pending_rows -= 1 if item[0] == "one" else len(item[3])
+            except queue.Empty:
+                pass
+            except Exception as e:
+                logging.info(f"Prediction log entry skipped: {e}")
+            if buffer and (stop or len(buffer) >= 1000 or time.monotonic() >= deadline):
+                try:
+                    self._write(buffer)
+                except Exception as e:
+                    logging.info(f"Prediction log write failed: {e}")
+                buffer = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.log_config.flush_interval
+        if self._file is not None:
+            # Hand the file over as a rotated one, so files of exited workers are not left behind
+            try:
+                if self._file.tell() > 0:
+                    self._rotate(reopen=False)
+                else:
+                    self._file.close()
+                    os.remove(self._file.name)
+            except Exception as e:
+                logging.info(f"Prediction log close failed: {e}")
+            self._file = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.log_config.enabled,
+            "path": self.path,
+            "sample_rate": self.log_config.sample_rate,
+            "pending_rows": self._pending_rows,
+            "written": self.written,
+            "dropped": self.dropped,
+            "rotations": self.rotations,
+        }
@@ -1,16 +1,20 @@
 import os
 import sys
+import time
 import numpy as np
 import pandas as pd
-import dill
 
 from src.exception import CustomException
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.metrics import r2_score
+from src.features.column_profile import profile_frame
 from src.logger import logging
 
+# sklearn, joblib and dill are imported inside the functions that need them so that
+# the serving path (app -> predict_pipeline -> utils) does not pull in training modules.
+
 def save_object(file_path, obj):
     try:
+        import dill
+
         dir_path = os.path.dirname(file_path)  # Sadece klasör yolunu al
         os.makedirs(dir_path, exist_ok=True)   # Klasörü oluştur
 
@@ -36,54 +40,306 @@ def check_dataframe(dataframe, head=5):
     print(dataframe.tail(head))
 
 
-def grab_col_names(dataframe, cat_th = 8, car_th=20):
-    cat_cols = [col for col in dataframe.columns if dataframe[col].dtypes=="O"]
-    num_but_cat =[col for col in dataframe.columns if 
-                  dataframe[col].nunique()<cat_th and dataframe[col].dtypes != "O"]
-    cat_but_car =[col for col in dataframe.columns if
-                  dataframe[col].nunique() > car_th and dataframe[col].dtypes == "O"]
-    cat_cols = cat_cols + num_but_cat
-    cat_cols = [col for col in cat_cols if col not in cat_but_car]
+def make_synthetic_students(n_rows, seed=42, source=os.path.join("notebook", "data", "student_data.csv")):
+    """
+    Synthetic student records scaled up from the original dataset for benchmarks
+    and load tests: every column is sampled independently from its empirical
+    distribution, so categories and value ranges match the real data.
+    """
+    base = pd.read_csv(source)
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        col: base[col].to_numpy()[rng.integers(0, len(base), n_rows)]
+        for col in base.columns
+    })
+
 
-    num_cols = [col for col in dataframe.columns if dataframe[col].dtypes != "O"]
-    num_cols = [col for col in num_cols if col not in num_but_cat]
+def grab_col_names(dataframe, cat_th = 8, car_th=20, profiles=None):
+    """
+    Split columns into categorical, numeric and cardinal-categorical ones from a
+    single cached profiling pass (profile_frame); pass `profiles` to reuse one.
+    """
+    profiles = profiles if profiles is not None else profile_frame(dataframe)
+    columns = [profiles[col] for col in dataframe.columns]
 
-    print(f"Observations : {dataframe.shape[0]}")
-    print(f"Variables : {dataframe.shape[1]}")
-    print(f"cat_cols : {len(cat_cols)}")
-    print(f"num_cols : {len(num_cols)}")
-    print(f"cat_but_car : {len(cat_but_car)}")
-    print(f"num_but_cat : {len(num_but_cat)}")
+    num_but_cat = [p.name for p in columns if not p.is_object and p.n_unique < cat_th]
+    cat_but_car = [p.name for p in columns if p.is_object and p.n_unique > car_th]
+    cat_cols = [p.name for p in columns if p.is_object and p.name not in cat_but_car] + num_but_cat
+    num_cols = [p.name for p in columns if not p.is_object and p.name not in num_but_cat]
+
+    logging.info(f"Observations : {dataframe.shape[0]}, Variables : {dataframe.shape[1]}, "
+                 f"cat_cols : {len(cat_cols)}, num_cols : {len(num_cols)}, "
+                 f"cat_but_car : {len(cat_but_car)}, num_but_cat : {len(num_but_cat)}")
 
     return cat_cols, num_cols, cat_but_car
 
-def evaluate_models(X_train, y_train, X_test, y_test, models, params, cv=3, n_jobs=3):
-    try:
-        report = {}
+SEARCH_STRATEGIES = ("grid", "random", "halving")
+
+
+def _n_fits(param_grid, cv, search="grid", n_iter=None):
+    n_cells = 1
+    for values in param_grid.values():
+        n_cells *= len(values)
+    if search == "random" and n_iter is not None:
+        n_cells = min(n_cells, n_iter)
+    return n_cells * cv if param_grid else 1
+
+
+class _DeadlineSearch:
+    """
+    Candidate search under a wall-clock deadline (time.time()), on public
+    sklearn API only: cells are scored in chunks of n_jobs with
+    GridSearchCV(refit=False), and once the deadline has passed no further chunk
+    starts (truncated_=True). The search overruns the deadline by at most one
+    chunk plus the refit of the best cell on all rows.
+
+    With factor set, cells go through successive halving rounds: each round
+    scores the surviving cells on a random sample of rows that grows by factor,
+    and keeps the best 1/factor of them (HalvingGridSearchCV's "exhaust" schedule).
+    """
 
-        for i in range(len(models)):
-            model_name = list(models.keys())[i]
-            model = models[model_name]
-            param_grid = params.get(model_name, {})  
+    refit = True
 
-            if param_grid:  
-                gs = GridSearchCV(model, param_grid, cv=cv, n_jobs=n_jobs, verbose=False)
-                gs.fit(X_train, y_train)
+    def __init__(self, estimator, candidates, cv, n_jobs, deadline, factor=None, random_state=42):
+        self.estimator = estimator
+        self.candidates = candidates
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.deadline = deadline
+        self.factor = factor
+        self.random_state = random_state
 
-                model.set_params(**gs.best_params_)
-                model.fit(X_train, y_train)
+    def _schedule(self, n_samples):
+        """Rows each round scores its cells on."""
+        if not self.factor:
+            return [n_samples]
+        n_rounds = 1
+        while self.factor ** n_rounds <= len(self.candidates):
+            n_rounds += 1
+        min_resources = max(n_samples // self.factor ** (n_rounds - 1), 2 * self.n_splits_)
+        while n_rounds > 1 and min_resources * self.factor ** (n_rounds - 1) > n_samples:
+            n_rounds -= 1
+        return [min_resources * self.factor ** i for i in range(n_rounds - 1)] + [n_samples]
+
+    def fit(self, X, y):
+        from joblib import effective_n_jobs
+        from sklearn.base import clone
+        from sklearn.model_selection import GridSearchCV, check_cv
+        from sklearn.utils import resample
+
+        chunk_size = max(1, effective_n_jobs(self.n_jobs))
+        self.n_splits_ = check_cv(self.cv).get_n_splits(X, y)
+        self.truncated_ = False
+        results = {"params": [], "mean_fit_time": [], "mean_score_time": [], "mean_test_score": [],
+                   "std_test_score": [], "n_resources": [], "iter": []}
+        survivors = list(self.candidates) or [{}]
+        for round_index, n_resources in enumerate(self._schedule(len(y))):
+            if n_resources < len(y):
+                X_round, y_round = resample(X, y, replace=False, n_samples=n_resources,
+                                            random_state=self.random_state + round_index)
             else:
-                model.fit(X_train, y_train)
+                X_round, y_round = X, y
+            scored = []  # (mean test score, index into results)
+            for start in range(0, len(survivors), chunk_size):
+                if results["params"] and time.time() >= self.deadline:
+                    self.truncated_ = True
+                    break
+                chunk = survivors[start:start + chunk_size]
+                gs = GridSearchCV(clone(self.estimator), [{k: [v] for k, v in p.items()} for p in chunk],
+                                  cv=self.cv, n_jobs=self.n_jobs, refit=False)
+                gs.fit(X_round, y_round)
+                cells = gs.cv_results_
+                for i, params in enumerate(cells["params"]):
+                    scored.append((float(cells["mean_test_score"][i]), len(results["params"])))
+                    results["params"].append(params)
+                    for key in ("mean_fit_time", "mean_score_time", "mean_test_score", "std_test_score"):
+                        results[key].append(float(cells[key][i]))
+                    results["n_resources"].append(n_resources)
+                    results["iter"].append(round_index)
+            if scored:
+                # Best first, ties to the earlier cell; the latest round that scored anything picks the winner
+                scored.sort(key=lambda cell: (-cell[0], cell[1]))
+                self.best_score_, self.best_index_ = scored[0]
+            if self.truncated_:
+                break
+            keep = -(-len(scored) // self.factor) if self.factor else len(scored)
+            survivors = [results["params"][index] for _, index in scored[:keep]]
+
+        self.cv_results_ = {key: value if key == "params" else np.asarray(value) for key, value in results.items()}
+        if not self.factor:
+            del self.cv_results_["n_resources"], self.cv_results_["iter"]
+        self.best_params_ = results["params"][self.best_index_]
+        refit_start = time.perf_counter()
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y)
+        self.refit_time_ = time.perf_counter() - refit_start
+        return self
+
+
+def _make_search(model, param_grid, search, cv, n_jobs, n_iter, deadline=None):
+    from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+    n_cells = _n_fits(param_grid, 1)
+    if search == "grid":
+        if deadline is not None:
+            return _DeadlineSearch(model, list(ParameterGrid(param_grid)), cv, n_jobs, deadline)
+        from sklearn.model_selection import GridSearchCV
+        return GridSearchCV(model, param_grid, cv=cv, n_jobs=n_jobs, verbose=False)
+    elif search == "random":
+        if deadline is not None:
+            # Same cells as RandomizedSearchCV(random_state=42) would draw
+            candidates = list(ParameterSampler(param_grid, n_iter=min(n_iter, n_cells), random_state=42))
+            return _DeadlineSearch(model, candidates, cv, n_jobs, deadline)
+        from sklearn.model_selection import RandomizedSearchCV
+        return RandomizedSearchCV(model, param_grid, n_iter=min(n_iter, n_cells), cv=cv,
+                                  n_jobs=n_jobs, random_state=42, verbose=False)
+    elif search == "halving":
+        # Successive halving: every cell starts on a small sample, survivors get more rows
+        if deadline is not None:
+            return _DeadlineSearch(model, list(ParameterGrid(param_grid)), cv, n_jobs, deadline, factor=3)
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingGridSearchCV
+        return HalvingGridSearchCV(model, param_grid, cv=cv, factor=3, n_jobs=n_jobs,
+                                   random_state=42, verbose=False)
+    else:
+        raise ValueError(f"Unknown search strategy {search!r}, expected one of {SEARCH_STRATEGIES}")
+
+
+def plan_model_workers(models, params, cv=3, n_jobs=None, max_workers=None):
+    """
+    Split a core budget between concurrent candidate searches (outer) and the
+    CV fits inside each search (inner), so that outer * inner <= max_workers.
+    Returns (outer_jobs, {model_name: inner_jobs}).
+    """
+    total = max(1, max_workers or os.cpu_count() or 1)
+    if n_jobs is not None:
+        inner_jobs = max(1, min(n_jobs, total))
+        outer_jobs = max(1, min(len(models), total // inner_jobs))
+    else:
+        # sqrt split: a handful of searches in flight, each with a few CV workers
+        outer_jobs = max(1, min(len(models), int(np.sqrt(total))))
+        inner_jobs = max(1, total // outer_jobs)
+
+    inner = {
+        name: min(inner_jobs, _n_fits(params.get(name, {}), cv))
+        for name in models
+    }
+    return outer_jobs, inner
+
+
+def _fit_candidate(model, param_grid, X_train, y_train, X_test, y_test, cv, n_jobs,
+                   search="grid", n_iter=20, deadline=None, name=None, profile_dir=None):
+    from joblib import parallel_backend
+    from sklearn.base import clone
+    from sklearn.metrics import r2_score
+    from src.components.training_profiler import profile_candidate, search_costs
 
-            y_train_pred = model.predict(X_train)
-            y_test_pred = model.predict(X_test)
+    start = time.perf_counter()
+    model = clone(model)
+    if param_grid and deadline is not None and time.time() >= deadline:
+        # Wall-clock budget spent before this search started: fit the default params only
+        search, param_grid = "budget_exhausted", {}
 
-            train_model_score = r2_score(y_train, y_train_pred)
-            test_model_score = r2_score(y_test, y_test_pred)
+    # Cap BLAS/OpenMP threads in the CV workers so nested pools do not oversubscribe cores
+    with parallel_backend("loky", inner_max_num_threads=1), \
+            profile_candidate(name or type(model).__name__, profile_dir, n_jobs=n_jobs) as cost:
+        if param_grid:
+            gs = _make_search(model, param_grid, search, cv, n_jobs, n_iter, deadline)
+            gs.fit(X_train, y_train)
+            truncated = getattr(gs, "truncated_", False)
 
-            logging.info(f"{model_name} - Train R2: {train_model_score:.4f}, Test R2: {test_model_score:.4f}")
+            # The search already refit the winner on the full training set
+            model = gs.best_estimator_
+            cv_score, refit_time, best_params = gs.best_score_, gs.refit_time_, gs.best_params_
+            search_cost = search_costs(gs)
+        else:
+            refit_start = time.perf_counter()
+            model.fit(X_train, y_train)
+            cv_score, refit_time, best_params = None, time.perf_counter() - refit_start, {}
+            search_cost = {"n_cells": 1, "n_fits": 1, "cv_fit_seconds": 0.0, "cells": []}
+            truncated = False
 
-            report[model_name] = test_model_score
+    y_train_pred = model.predict(X_train)
+    y_test_pred = model.predict(X_test)
+
+    scores = {
+        "train_r2": r2_score(y_train, y_train_pred),
+        "test_r2": r2_score(y_test, y_test_pred),
+        "cv_r2": cv_score,
+        "refit_time": refit_time,
+        "best_params": best_params,
+        "search": search if param_grid or search == "budget_exhausted" else "none",
+        "budget_truncated": truncated,
+        "fit_seconds": time.perf_counter() - start,
+        "cpu_seconds": cost["cpu_seconds"],
+        "children_cpu_seconds": cost["children_cpu_seconds"],
+        "peak_rss_mb": cost["peak_rss_mb"],
+        "n_cells": search_cost["n_cells"],
+        "n_fits": search_cost["n_fits"],
+        "cv_fit_seconds": search_cost["cv_fit_seconds"],
+        "cells": search_cost["cells"],
+    }
+    if "profile_path" in cost:
+        scores["profile_path"] = cost["profile_path"]
+    return model, scores
+
+
+def evaluate_models(X_train, y_train, X_test, y_test, models, params, cv=3, n_jobs=None, max_workers=None,
+                    search="grid", n_iter=20, time_budget=None, profile_dir=None):
+    """
+    Tune and score every candidate, running candidate searches concurrently in a
+    process pool. Heaviest grids are dispatched first; results do not depend on
+    the number of workers. Fitted estimators are written back into ``models``.
+
+    search: "grid" (exhaustive), "random" (at most n_iter cells per model) or
+    "halving" (successive halving over the grid). time_budget is a soft
+    wall-clock limit in seconds for the whole run: running searches stop
+    dispatching cells once it passes and refit the best cell evaluated so far
+    (budget_truncated=True), and searches that have not started fall back to a
+    single fit with default params. A search can overrun the budget by one
+    round of n_jobs cells plus its refit.
+
+    Every candidate is profiled (see src.components.training_profiler);
+    profile_dir additionally writes a cProfile dump per candidate.
+
+    Returns {model_name: {"train_r2", "test_r2", "cv_r2", "refit_time",
+    "best_params", "search", "budget_truncated", "fit_seconds", "cpu_seconds", "children_cpu_seconds",
+    "peak_rss_mb", "n_cells", "n_fits", "cv_fit_seconds", "cells"}}.
+    """
+    try:
+        from joblib import Parallel, delayed
+
+        if search not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search strategy {search!r}, expected one of {SEARCH_STRATEGIES}")
+        deadline = time.time() + time_budget if time_budget is not None else None
+
+        outer_jobs, inner_jobs = plan_model_workers(models, params, cv=cv, n_jobs=n_jobs, max_workers=max_workers)
+        # Longest-processing-time first keeps the slow grids off the tail of the schedule
+        order = sorted(models, key=lambda name: -_n_fits(params.get(name, {}), cv, search, n_iter))
+        logging.info(f"Model selection ({search}): {outer_jobs} concurrent searches, inner jobs {inner_jobs}")
+
+        results = Parallel(n_jobs=outer_jobs, backend="loky")(
+            delayed(_fit_candidate)(
+                models[model_name], params.get(model_name, {}),
+                X_train, y_train, X_test, y_test, cv, inner_jobs[model_name],
+                search=search, n_iter=n_iter, deadline=deadline, name=model_name, profile_dir=profile_dir
+            )
+            for model_name in order
+        )
+        fitted = dict(zip(order, results))
+
+        report = {}
+        for model_name in models:
+            model, scores = fitted[model_name]
+            models[model_name] = model
+
+            logging.info(
+                f"{model_name} - Train R2: {scores['train_r2']:.4f}, Test R2: {scores['test_r2']:.4f}, "
+                f"refit {scores['refit_time']:.2f}s of {scores['fit_seconds']:.1f}s, "
+                f"{scores['n_fits']} fits, peak RSS {scores['peak_rss_mb']:.0f}MB, "
+                f"search {scores['search']}, params {scores['best_params']}"
+            )
+
+            report[model_name] = scores
 
         return report
 
@@ -93,8 +349,28 @@ def evaluate_models(X_train, y_train, X_test, y_test, models, params, cv=3, n_jo
 
 def load_object(file_path):
     try:
+        import dill
+
         with open(file_path, "rb") as file_obj:
             return dill.load(file_obj)
     
     except Exception as e:
-        raise CustomException(e, sys)
\ No newline at end of file
+        raise CustomException(e, sys)
+
+
+def resident_memory_bytes() -> int:
+    """Current RSS from /proc on Linux, else the peak RSS reported by getrusage."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_memory_bytes()
+
+
+def peak_memory_bytes() -> int:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB on Linux
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import app as app_module
+from src.features.schema import CUSTOM_DATA_FIELDS
+from src.pipeline.predict_pipeline import PredictPipeline
+
+
+def _records(n):
+    df = pd.read_csv('notebook/data/student_data.csv')[list(CUSTOM_DATA_FIELDS)].iloc[:n]
+    return df, df.to_dict('records')
+
+
+def _client(monkeypatch, tmp_path):
+    monkeypatch.setattr(app_module.prediction_log.log_config, "log_dir", str(tmp_path))
+    return TestClient(app_module.app)
+
+
+def test_predict_batch_keeps_input_order_and_rejects_out_of_range_rows(monkeypatch, tmp_path):
+    df, records = _records(5)
+    with _client(monkeypatch, tmp_path) as client:
+        response = client.post("/predict/batch", json={"records": records})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["count"] == 5
+        assert np.allclose(body["predictions"], PredictPipeline().predict(df))
+        assert set(body["timings_ms"]) == {"build_columns", "validate", "predict", "total"}
+
+        records[2] = {**records[2], "absences": 10_000}
+        response = client.post("/predict/batch", json={"records": records})
+        assert response.status_code == 422
+        body = response.json()
+        assert body["invalid_rows"] == 1 and body["errors"][0]["row"] == 2
+        assert set(body["errors"][0]["errors"]) == {"absences"}
+
+
+def test_predict_form_returns_error_statuses(monkeypatch, tmp_path):
+    _, records = _records(2)
+    with _client(monkeypatch, tmp_path) as client:
+        assert client.post("/predict", data=records[0]).status_code == 200
+
+        response = client.post("/predict", data={**records[0], "age": 999})
+        assert response.status_code == 422 and "Invalid input" in response.text
+
+        async def failing_submit(record):
+            raise RuntimeError("model unavailable")
+
+        monkeypatch.setattr(app_module.batcher, "submit", failing_submit)
+        response = client.post("/predict", data=records[1])  # not in the prediction cache
+        assert response.status_code == 500 and "model unavailable" in response.text
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import Ridge
+from src.features.engineer import engineer_features
+from src.pipeline.artifact_bundle import save_bundle, load_bundle
+from src.utils import load_object
+
+
+def test_bundle_roundtrip_matches_pickled_artifacts(tmp_path):
+    df = pd.read_csv('notebook/data/cleaned_student_data.csv').drop(columns=['G3'])
+    X = engineer_features(df.head(50))
+    X.loc[0, 'Mjob'] = 'astronaut'  # unknown category -> all zeros, like handle_unknown="ignore"
+    preprocessor = load_object('artifacts/preprocessor.pkl')
+    expected = preprocessor.transform(X)
+    model = Ridge().fit(expected, np.arange(len(X), dtype=float))
+
+    manifest = save_bundle(str(tmp_path), model, preprocessor)
+    assert manifest['model']['kind'] == 'linear'
+    assert manifest['preprocessor']['kind'] == 'column_transformer'
+
+    bundle = load_bundle(str(tmp_path))
+    transformed = bundle.preprocessor.transform(X)
+    assert np.array_equal(transformed, expected)
+    assert np.array_equal(bundle.model.predict(transformed), model.predict(expected))
+
+
+def test_save_bundle_writes_new_version_without_touching_loaded_files(tmp_path):
+    rng = np.random.RandomState(0)
+    X = rng.normal(size=(40, 3))
+    first = save_bundle(str(tmp_path), Ridge().fit(X, X[:, 0]), None)
+    loaded = load_bundle(str(tmp_path))
+    coef = np.array(loaded.model.coef_)
+
+    second = save_bundle(str(tmp_path), Ridge().fit(X, X[:, 1]), None, keep_versions=2)
+    assert second['root'] != first['root']
+    # The memory-mapped arrays of the first version still hold its values
+    assert np.array_equal(loaded.model.coef_, coef)
+    assert not np.array_equal(load_bundle(str(tmp_path)).model.coef_, coef)
+
+    save_bundle(str(tmp_path), Ridge().fit(X, X[:, 2]), None, keep_versions=2)
+    versions = sorted(p.name for p in (tmp_path / 'versions').iterdir())
+    assert len(versions) == 2 and first['root'].split('/')[-1] not in versions
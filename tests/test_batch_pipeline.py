@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from src.pipeline.batch_pipeline import BatchPredictConfig, BatchPredictPipeline
+from src.pipeline.predict_pipeline import PredictPipeline
+
+
+def test_batch_pipeline_streams_chunks_in_order(tmp_path):
+    df = pd.read_csv('notebook/data/cleaned_student_data.csv').drop(columns=['G3']).head(250)
+    input_path = tmp_path / 'students.csv'
+    df.to_csv(input_path, index=False)
+    expected = PredictPipeline().predict(df)
+
+    for workers in (1, 2):
+        output_path = tmp_path / f'predictions_{workers}.csv'
+        stats = BatchPredictPipeline(BatchPredictConfig(chunk_size=60, workers=workers)).run(
+            str(input_path), str(output_path)
+        )
+        assert stats['rows'] == 250
+        assert stats['chunks'] == 5
+        out = pd.read_csv(output_path)
+        assert list(out.columns) == list(df.columns) + ['prediction']
+        assert np.allclose(out['prediction'].to_numpy(), expected)
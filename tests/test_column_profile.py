@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from src.features.column_profile import (ColumnProfileConfig, HyperLogLog, clear_profile_cache, profile_column,
+                                         profile_frame)
+from src.utils import grab_col_names
+
+
+def test_profile_frame_counts_nulls_cardinality_and_stats():
+    df = pd.DataFrame({
+        "Mjob": ["health", None, "other", "health"],
+        "absences": [0.0, 4.0, np.nan, 10.0],
+        "failures": [0, 1, 0, 3],
+    })
+    profiles = profile_frame(df)
+    assert profiles["Mjob"].is_object and profiles["Mjob"].n_null == 1
+    assert profiles["Mjob"].n_unique == 2 and profiles["Mjob"].categories == ["health", "other"]
+    assert profiles["absences"].n_null == 1 and profiles["absences"].n_unique == 3
+    assert profiles["absences"].min == 0.0 and profiles["absences"].max == 10.0
+    assert profiles["failures"].n_unique == 3 and not profiles["failures"].approximate
+
+
+def test_grab_col_names_matches_nunique_and_reuses_cached_profiles():
+    clear_profile_cache()
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "school": rng.choice(["GP", "MS"], 500),
+        "name": [f"student_{i}" for i in range(500)],
+        "studytime": rng.integers(1, 5, 500),
+        "absences": rng.integers(0, 60, 500),
+    })
+    cat_cols, num_cols, cat_but_car = grab_col_names(df)
+    assert cat_cols == ["school", "studytime"] and num_cols == ["absences"] and cat_but_car == ["name"]
+
+    first = profile_column(df["absences"])
+    assert profile_column(df["absences"].copy()) is first  # same values, served from the cache
+    changed = df["absences"].copy()
+    changed.iloc[250] += 1
+    assert profile_column(changed) is not first
+
+    names = df["name"].copy()
+    assert profile_column(names).n_unique == 500
+    names.iloc[250] = "student_0"  # object columns are not cached, so an in-place edit is seen
+    assert profile_column(names).n_unique == 499
+
+
+def test_hyperloglog_estimates_large_numeric_columns():
+    values = np.random.default_rng(1).normal(size=300_000)
+    sketch = HyperLogLog(14).update(pd.util.hash_array(values))
+    assert abs(sketch.count() - 300_000) / 300_000 < 0.03
+
+    profile = profile_column(pd.Series(values, name="x"), ColumnProfileConfig(hll_min_rows=100_000))
+    assert profile.approximate and abs(profile.n_unique - 300_000) / 300_000 < 0.03
+    assert profile.categories is None
@@ -0,0 +1,70 @@
+import json
+import numpy as np
+import pandas as pd
+from src.features.engineer import engineer_features, ENGINEERED_COLS
+from src.pipeline.compiled_plan import CompiledPlan
+from src.utils import load_object
+
+
+def test_compiled_plan_matches_preprocessor_exactly():
+    df = pd.read_csv('notebook/data/cleaned_student_data.csv').drop(columns=['G3'] + ENGINEERED_COLS)
+    df.loc[3, 'Fjob'] = 'astronaut'
+    preprocessor = load_object('artifacts/preprocessor.pkl')
+    expected = preprocessor.transform(engineer_features(df))
+
+    plan = CompiledPlan.from_preprocessor(preprocessor)
+    records = df.to_dict('records')
+    assert np.array_equal(plan.transform_records(records), expected)
+    for i in (0, 3, 100):
+        assert np.array_equal(plan.transform_record(records[i])[0], expected[i])
+
+
+def test_compiled_plan_matches_imputing_preprocessor():
+    from src.components.data_transformation import DataTransformation
+
+    train = pd.read_csv('artifacts/train.csv').drop(columns=['G3'])
+    preprocessor = DataTransformation().get_data_transformer_object(engineer_features(train))
+    preprocessor.fit(engineer_features(train))
+
+    X = train.head(40).copy()
+    X.loc[0, 'age'] = np.nan
+    X.loc[1, 'Mjob'] = np.nan
+    expected = preprocessor.transform(engineer_features(X))
+    expected = expected.toarray() if hasattr(expected, 'toarray') else expected
+
+    plan = CompiledPlan.from_preprocessor(preprocessor)
+    assert np.array_equal(plan.transform_records(X.to_dict('records')), expected)
+
+
+def test_custom_data_batch_columns_match_preprocessor():
+    from src.pipeline.predict_pipeline import CUSTOM_DATA_FIELDS, CustomData, CustomDataBatch
+
+    df = pd.read_csv('notebook/data/cleaned_student_data.csv')[list(CUSTOM_DATA_FIELDS)]
+    df.loc[5, 'Mjob'] = 'astronaut'
+    preprocessor = load_object('artifacts/preprocessor.pkl')
+    expected = preprocessor.transform(engineer_features(df))
+
+    batch = CustomDataBatch.from_json(json.dumps(df.to_dict('records')))
+    assert len(batch) == len(df)
+    frame = batch.to_dataframe()
+    assert np.shares_memory(frame['age'].to_numpy(), batch['age'])
+    plan = CompiledPlan.from_preprocessor(preprocessor)
+    assert np.array_equal(plan.transform_columns(batch.columns, len(batch)), expected)
+
+    record = CustomData(**df.iloc[0].to_dict())
+    assert not hasattr(record, '__dict__')
+    assert record.to_dict() == df.iloc[0].to_dict()
+
+
+def test_custom_data_to_dataframe_keeps_integer_dtypes():
+    from src.pipeline.predict_pipeline import CUSTOM_DATA_FIELDS, CustomData, CustomDataBatch
+
+    record = pd.read_csv('notebook/data/student_data.csv')[list(CUSTOM_DATA_FIELDS)].iloc[0].to_dict()
+    frame = CustomData(**record).to_dataframe()
+    assert frame['age'].dtype == np.int64 and frame['absences'].dtype == np.int64
+    assert frame['Mjob'].dtype == object
+
+    # A non-whole value keeps the column float, as pandas would infer it
+    batch = CustomDataBatch.from_records([record, {**record, 'absences': 4.5}])
+    assert batch['absences'].dtype == np.float64 and batch['absences'][1] == 4.5
+    assert batch['age'].dtype == np.int64
@@ -0,0 +1,47 @@
+import numpy as np
+from sklearn.model_selection import GridSearchCV
+from xgboost import XGBRegressor
+from catboost import CatBoostRegressor
+from src.components.early_stopping import EarlyStoppingRegressor, with_early_stopping, unwrap_early_stopping
+
+
+def _data():
+    rng = np.random.RandomState(0)
+    X = rng.normal(size=(300, 4))
+    y = 2 * X[:, 0] - X[:, 1] + rng.normal(scale=0.3, size=300)
+    return X, y
+
+
+def test_with_early_stopping_rewrites_grid_and_trims_xgboost():
+    X, y = _data()
+    grid = {"n_estimators": [50, 400], "max_depth": [2, 3]}
+    model, es_grid = with_early_stopping(XGBRegressor(learning_rate=0.3, random_state=42), grid, 10)
+    assert isinstance(model, EarlyStoppingRegressor)
+    assert es_grid == {"estimator__max_depth": [2, 3]}
+    assert model.estimator.get_params()["n_estimators"] == 400
+
+    gs = GridSearchCV(model, es_grid, cv=3).fit(X, y)
+    booster = unwrap_early_stopping(gs.best_estimator_)
+    assert booster.n_estimators == gs.best_estimator_.best_iteration_ < 400
+    assert booster.get_booster().num_boosted_rounds() == booster.n_estimators
+
+
+def test_early_stopping_catboost_uses_best_model():
+    X, y = _data()
+    model = EarlyStoppingRegressor(
+        CatBoostRegressor(iterations=400, learning_rate=0.3, verbose=False, allow_writing_files=False), 10
+    ).fit(X, y)
+    assert model.best_iteration_ == model.estimator_.tree_count_ < 400
+    assert model.predict(X[:3]).shape == (3,)
+
+
+def test_early_stopping_refits_on_all_rows():
+    X, y = _data()
+    base = XGBRegressor(n_estimators=400, learning_rate=0.3, random_state=42)
+    model = EarlyStoppingRegressor(base, 10).fit(X, y)
+    full = XGBRegressor(n_estimators=model.best_iteration_, learning_rate=0.3, random_state=42).fit(X, y)
+    np.testing.assert_allclose(model.predict(X), full.predict(X), rtol=1e-6)
+
+    split_only = EarlyStoppingRegressor(base, 10, refit_full=False).fit(X, y)
+    assert split_only.best_iteration_ == model.best_iteration_
+    assert not np.allclose(split_only.predict(X), model.predict(X))
@@ -1,5 +1,5 @@
 import pandas as pd
-from src.features.engineer import engineer_features, ENGINEERED_COLS
+from src.features.engineer import engineer_columns, engineer_features, engineer_record, ENGINEERED_COLS
 
 
 def test_engineer_features_basic():
@@ -49,3 +49,35 @@ def test_engineer_features_basic():
     assert out.loc[0, 'high_absenteeism'] == 0
     assert out.loc[1, 'high_absenteeism'] == 1
 
+
+
+def test_engineer_record_matches_engineer_features():
+    df = pd.read_csv('notebook/data/cleaned_student_data.csv').drop(columns=['G3'] + ENGINEERED_COLS)
+    out = engineer_features(df)
+    for i in (0, 7, 42):
+        record = engineer_record(df.iloc[i].to_dict())
+        assert record == {c: out.loc[i, c] for c in ENGINEERED_COLS}
+
+
+def test_engineer_features_compact_matches_default():
+    df = pd.read_csv('notebook/data/cleaned_student_data.csv').drop(columns=['G3'] + ENGINEERED_COLS)
+    before = df.copy()
+    default = engineer_features(df)
+    compact = engineer_features(df, compact=True)
+    assert df.equals(before)
+    assert list(compact.columns) == list(default.columns)
+    assert compact['has_failures'].dtype == 'int8'
+    assert compact['avg_parent_edu'].dtype == 'float32'
+    assert (compact[ENGINEERED_COLS].to_numpy(dtype=float) == default[ENGINEERED_COLS].to_numpy(dtype=float)).all()
+
+    inplace = engineer_features(df, compact=True, inplace=True)
+    assert inplace is df
+    assert all(c in df.columns for c in ENGINEERED_COLS)
+
+
+def test_rules_with_missing_inputs_are_skipped_in_every_path():
+    df = pd.DataFrame({'Medu': [4, 1], 'Fedu': [2, 1], 'internet': ['yes', 'no'], 'Dalc': [3, 1]})
+    expected = ['avg_parent_edu', 'has_internet']
+    assert [c for c in engineer_features(df).columns if c in ENGINEERED_COLS] == expected
+    assert list(engineer_columns(df)) == expected
+    assert engineer_record(df.iloc[0].to_dict()) == {'avg_parent_edu': 3.0, 'has_internet': 1}
@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+
+def test_serving_imports_skip_training_modules():
+    code = (
+        "import sys, app; "
+        "print(','.join(m for m in ['sklearn.model_selection', 'sklearn.metrics', 'catboost', 'xgboost', 'dill'] "
+        "if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from src.features.schema import build_schema
+from src.pipeline.input_schema import InputSchema
+from src.pipeline.predict_pipeline import CustomDataBatch
+
+
+def test_input_schema_reports_bad_rows():
+    schema = InputSchema(build_schema(pd.read_csv('artifacts/train.csv')))
+    df = pd.read_csv('artifacts/test.csv')
+    assert schema.validate_record(df.iloc[0].to_dict()) == {}
+
+    df.loc[2, 'Mjob'] = 'astronaut'
+    df.loc[2, 'age'] = 99
+    df.loc[7, 'G2'] = -3
+    batch = CustomDataBatch.from_records(df.to_dict('records'))
+    failures = schema.validate_columns(batch.columns, len(batch))
+    assert [f['row'] for f in failures] == [2, 7]
+    assert set(failures[0]['errors']) == {'Mjob', 'age'}
+    assert set(failures[1]['errors']) == {'G2'}
+    assert set(schema.validate_record(df.iloc[2].to_dict())) == {'Mjob', 'age'}
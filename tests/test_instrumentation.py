@@ -0,0 +1,18 @@
+from src.pipeline.instrumentation import Counter, Histogram
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    histogram = Histogram("stage_seconds", "Stage time.", ["stage"], buckets=(0.01, 0.1))
+    for value in (0.005, 0.05, 0.5):
+        histogram.observe(value, "predict")
+    text = histogram.render()
+    assert '# TYPE stage_seconds histogram' in text
+    assert 'stage_seconds_bucket{stage="predict",le="0.01"} 1' in text
+    assert 'stage_seconds_bucket{stage="predict",le="0.1"} 2' in text
+    assert 'stage_seconds_bucket{stage="predict",le="+Inf"} 3' in text
+    assert 'stage_seconds_count{stage="predict"} 3' in text
+
+    counter = Counter("requests_total", "Requests.", ["status"])
+    counter.inc("200")
+    counter.inc("200")
+    assert 'requests_total{status="200"} 2' in counter.render()
@@ -0,0 +1,57 @@
+import json
+import logging
+import os
+import sys
+import time
+
+import pytest
+
+from src import logger
+from src.logger import JsonFormatter, _QueueHandler, _RotatingFileHandler
+
+
+def test_file_handler_creates_directory_on_first_record(tmp_path):
+    path = tmp_path / "nested" / "app.log"
+    handler = _RotatingFileHandler(str(path), maxBytes=1000, backupCount=1, delay=True)
+    handler.setFormatter(JsonFormatter())
+    assert not path.parent.exists()
+
+    record = logging.LogRecord("src", logging.INFO, __file__, 10, "scored %d rows", (5,), None)
+    queued = _QueueHandler(None).prepare(record)
+    assert queued.msg == "scored 5 rows" and queued.args is None
+    handler.handle(queued)
+    handler.close()
+
+    entry = json.loads(path.read_text(encoding="utf-8"))
+    assert entry["message"] == "scored 5 rows" and entry["level"] == "INFO" and entry["lineno"] == 10
+
+
+def test_json_formatter_keeps_traceback_resolved_before_queueing():
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        record = logging.LogRecord("src", logging.ERROR, __file__, 1, "failed", None, sys.exc_info())
+    queued = _QueueHandler(None).prepare(record)
+    assert queued.exc_info is None
+    assert record.exc_info is not None and record.msg == "failed"  # later handlers still get the original
+    entry = json.loads(JsonFormatter().format(queued))
+    assert "ValueError: bad input" in entry["exc_info"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork") or logger.LOG_ROTATION == "external", reason="needs fork, per-process files")
+def test_forked_child_writes_its_own_log_file():
+    marker = f"forked child {time.time_ns()}"
+    pid = os.fork()
+    if pid == 0:
+        try:
+            logging.getLogger("src").info(marker)
+            logger.stop_listener()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    child_path = logger.log_file_path().replace(f".{os.getpid()}.", f".{pid}.")
+    try:
+        with open(child_path, encoding="utf-8") as f:
+            assert marker in f.read()
+    finally:
+        os.remove(child_path)
@@ -0,0 +1,52 @@
+import asyncio
+from src.pipeline.micro_batcher import MicroBatcher, MicroBatcherConfig
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    sizes = []
+
+    def predict(records):
+        sizes.append(len(records))
+        return [r["x"] * 2 for r in records]
+
+    async def scenario():
+        batcher = MicroBatcher(predict, MicroBatcherConfig(max_batch_rows=8, max_wait_ms=20))
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit({"x": i}) for i in range(20)))
+        stats = batcher.stats()
+        await batcher.stop()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+    assert results == [2.0 * i for i in range(20)]
+    assert sum(sizes) == 20
+    assert max(sizes) <= 8
+    assert len(sizes) < 20
+    assert stats["rows"] == 20
+    assert stats["queue_depth"] == 0
+
+
+def test_micro_batcher_isolates_bad_records_and_fails_pending_on_stop():
+    def predict(records):
+        if any(r["x"] < 0 for r in records):
+            raise ValueError("negative x")
+        return [r["x"] * 2 for r in records]
+
+    async def scenario():
+        batcher = MicroBatcher(predict, MicroBatcherConfig(max_batch_rows=8, max_wait_ms=20))
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit({"x": x}) for x in (1, -1, 3)), return_exceptions=True)
+
+        # A request still waiting for its batch window when the batcher stops is failed, not left hanging
+        slow = MicroBatcher(predict, MicroBatcherConfig(max_batch_rows=8, max_wait_ms=10_000))
+        await slow.start()
+        pending = asyncio.ensure_future(slow.submit({"x": 5}))
+        await asyncio.sleep(0.05)
+        await slow.stop()
+        await batcher.stop()
+        return results, await asyncio.gather(pending, return_exceptions=True)
+
+    results, (stopped,) = asyncio.run(scenario())
+    assert results[0] == 2.0 and results[2] == 6.0
+    assert isinstance(results[1], ValueError)
+    assert isinstance(stopped, RuntimeError)
@@ -0,0 +1,87 @@
+import os
+import threading
+from src.utils import save_object
+from src.pipeline.model_registry import ModelRegistry, ModelRegistryConfig
+
+
+def _registry(tmp_path):
+    return ModelRegistry(ModelRegistryConfig(
+        model_file_path=str(tmp_path / "model.pkl"),
+        preprocessor_file_path=str(tmp_path / "preprocessor.pkl"),
+        check_interval=0,
+    ))
+
+
+def test_registry_loads_once_and_reloads_on_change(tmp_path):
+    save_object(str(tmp_path / "model.pkl"), {"version": 1})
+    save_object(str(tmp_path / "preprocessor.pkl"), {"prep": True})
+    registry = _registry(tmp_path)
+
+    first = registry.model()
+    assert registry.model() is first
+    assert registry.misses == 1
+    assert registry.hits == 1
+
+    # Same content with a new mtime keeps the loaded object
+    stat = os.stat(tmp_path / "model.pkl")
+    os.utime(tmp_path / "model.pkl", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert registry.model() is first
+    assert registry.reloads == 0
+
+    save_object(str(tmp_path / "model.pkl"), {"version": 2})
+    stat = os.stat(tmp_path / "model.pkl")
+    os.utime(tmp_path / "model.pkl", ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert registry.model() == {"version": 2}
+    assert registry.reloads == 1
+
+    stats = registry.stats()
+    assert stats["misses"] == 2
+    assert str(tmp_path / "model.pkl") in stats["artifacts"]
+
+
+def test_metadata_is_cached_without_metrics_file(tmp_path):
+    save_object(str(tmp_path / "model.pkl"), {"version": 1})
+    save_object(str(tmp_path / "preprocessor.pkl"), {"prep": True})
+    registry = ModelRegistry(ModelRegistryConfig(
+        model_file_path=str(tmp_path / "model.pkl"),
+        preprocessor_file_path=str(tmp_path / "preprocessor.pkl"),
+        metrics_file_path=str(tmp_path / "metrics.json"),
+        check_interval=0,
+    ))
+    first = registry.metadata()
+    assert first.metrics == {}
+    assert registry.metadata() is first
+
+    (tmp_path / "metrics.json").write_text('{"R2": 0.9}', encoding="utf-8")
+    assert registry.metadata().metrics == {"R2": 0.9}
+
+
+def test_registry_with_file_watch_off_reloads_only_on_refresh(tmp_path):
+    save_object(str(tmp_path / "model.pkl"), {"version": 1})
+    registry = ModelRegistry(ModelRegistryConfig(model_file_path=str(tmp_path / "model.pkl"), check_interval=-1))
+    assert registry.model() == {"version": 1}
+
+    save_object(str(tmp_path / "model.pkl"), {"version": 2})
+    stat = os.stat(tmp_path / "model.pkl")
+    os.utime(tmp_path / "model.pkl", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert registry.model() == {"version": 1}
+    registry.refresh()
+    assert registry.model() == {"version": 2}
+
+
+def test_registry_counts_every_hit_across_threads(tmp_path):
+    path = tmp_path / "model.pkl"
+    path.write_bytes(b"v1")
+    registry = ModelRegistry(ModelRegistryConfig(check_interval=60.0))
+    registry.get(path, loader=lambda p: b"v1")
+
+    def worker():
+        for _ in range(2000):
+            registry.get(path, loader=lambda p: b"v1")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert registry.misses == 1 and registry.hits == 8 * 2000
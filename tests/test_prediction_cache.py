@@ -0,0 +1,29 @@
+import time
+
+from src.pipeline.prediction_cache import PredictionCache, PredictionCacheConfig
+
+
+def test_prediction_cache_lru_ttl_and_version():
+    version = {"value": "v1"}
+    cache = PredictionCache(lambda: version["value"], PredictionCacheConfig(max_entries=2, ttl_seconds=0.2))
+
+    # Form strings and JSON numbers for the same profile share one key
+    assert cache.key({"age": "17", "school": "GP "}) == cache.key({"school": "GP", "age": 17.0})
+
+    cache.put(cache.key({"age": 17}), 11.0)
+    cache.put(cache.key({"age": 18}), 12.0)
+    assert cache.get(cache.key({"age": 17})) == 11.0
+    cache.put(cache.key({"age": 19}), 13.0)  # evicts age=18, the least recently used
+    assert cache.get(cache.key({"age": 18})) is None
+    assert cache.get(cache.key({"age": 19})) == 13.0
+
+    version["value"] = "v2"
+    assert cache.get(cache.key({"age": 19})) is None
+
+    version["value"] = "v1"
+    time.sleep(0.25)
+    assert cache.get(cache.key({"age": 19})) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["evictions"] == 1 and stats["expirations"] >= 1
+    assert stats["memory_bytes"] > 0
@@ -0,0 +1,49 @@
+import gzip
+import json
+import os
+import threading
+
+import numpy as np
+
+from src.pipeline.prediction_log import PredictionLogConfig, PredictionLogWriter
+
+
+def test_prediction_log_writes_rotates_and_samples(tmp_path):
+    writer = PredictionLogWriter(PredictionLogConfig(enabled=True, log_dir=str(tmp_path), sample_rate=1.0,
+                                                     compress=True, max_bytes=2000, flush_interval=0.05))
+    writer.log({"age": 17, "Mjob": "health"}, 11.5, "abc123", {"total": 1.0}, endpoint="/predict")
+    columns = {"age": np.arange(30, dtype=np.float64), "Mjob": np.array(["other"] * 30, dtype=object)}
+    writer.log_batch(columns, np.linspace(0, 1, 30), "abc123", {"total": 2.0}, endpoint="/predict/batch")
+    writer.close()
+
+    lines = []
+    for name in sorted(os.listdir(tmp_path)):
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(tmp_path / name, "rt", encoding="utf-8") as f:
+            lines.extend(json.loads(line) for line in f)
+    assert writer.rotations >= 1 and any(name.endswith(".gz") for name in os.listdir(tmp_path))
+    assert len(lines) == writer.written == 31
+    first = next(line for line in lines if line["endpoint"] == "/predict")
+    assert first["features"] == {"age": 17, "Mjob": "health"} and first["model_version"] == "abc123"
+    assert {line["row"] for line in lines if "row" in line} == set(range(30))
+
+    quiet = PredictionLogWriter(PredictionLogConfig(enabled=True, log_dir=str(tmp_path / "quiet"), sample_rate=0.0))
+    quiet.log({"age": 17}, 1.0, "abc123", {})
+    quiet.close()
+    assert quiet.written == 0
+
+
+def test_prediction_log_bounds_pending_rows_and_hands_over_file_on_close(tmp_path):
+    writer = PredictionLogWriter(PredictionLogConfig(enabled=True, log_dir=str(tmp_path), sample_rate=1.0,
+                                                     compress=False, max_pending_rows=100, flush_interval=0.05))
+    gate, lines = threading.Event(), writer._lines
+    writer._lines = lambda item: (gate.wait(5), lines(item))[1]  # hold the writer on the first batch
+    writer.log_batch({"age": np.arange(80, dtype=np.float64)}, np.zeros(80), "abc123", {})
+    writer.log_batch({"age": np.arange(80, dtype=np.float64)}, np.zeros(80), "abc123", {})  # 160 rows > 100
+    writer.log_batch({"age": np.arange(20, dtype=np.float64)}, np.zeros(20), "abc123", {})
+    gate.set()
+    writer.close()
+    assert writer.dropped == 80 and writer.written == 100 and writer.stats()["pending_rows"] == 0
+
+    names = os.listdir(tmp_path)
+    assert len(names) == 1 and names[0].startswith("predictions-") and names[0].endswith(f".{os.getpid()}.jsonl")
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from run_g3_pipeline import evict_preprocessing_cache, make_preprocessing_cache  # noqa: E402
+
+FITS = []
+
+
+class CountingScaler(StandardScaler):
+    def fit(self, X, y=None, sample_weight=None):
+        FITS.append(len(X))
+        return super().fit(X, y, sample_weight)
+
+
+def test_preprocessing_cache_reuses_fold_fits_and_evicts(tmp_path):
+    rng = np.random.RandomState(0)
+    X, y = rng.normal(size=(60, 3)), rng.normal(size=60)
+    memory = make_preprocessing_cache(str(tmp_path / "cache"))
+    assert make_preprocessing_cache("") is None
+
+    for alpha in (0.1, 1.0):  # two grid cells on the same fold
+        Pipeline([("prep", CountingScaler()), ("model", Ridge(alpha=alpha))], memory=memory).fit(X, y)
+    assert FITS == [60]  # the second cell got the cached preprocessing
+    Pipeline([("prep", CountingScaler()), ("model", Ridge())], memory=memory).fit(X[:40], y[:40])
+    assert FITS == [60, 40]  # another fold is a new entry
+
+    assert len(memory.store_backend.get_items()) == 2
+    evict_preprocessing_cache(memory, max_mb=0)
+    assert len(memory.store_backend.get_items()) == 0
+    evict_preprocessing_cache(None, max_mb=0)  # cache disabled: nothing to do
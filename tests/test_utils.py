@@ -0,0 +1,123 @@
+import time
+
+import numpy as np
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.tree import DecisionTreeRegressor
+from src.utils import _make_search, evaluate_models, plan_model_workers
+
+
+def _data():
+    rng = np.random.RandomState(0)
+    X = rng.normal(size=(120, 4))
+    y = X @ np.array([1.0, -2.0, 0.5, 0.0]) + rng.normal(scale=0.1, size=120)
+    return X[:90], y[:90], X[90:], y[90:]
+
+
+def _candidates():
+    models = {
+        "Linear_Regression": LinearRegression(),
+        "Ridge": Ridge(),
+        "Decision Tree": DecisionTreeRegressor(random_state=42),
+    }
+    params = {
+        "Linear_Regression": {},
+        "Ridge": {"alpha": [0.1, 1.0, 10.0]},
+        "Decision Tree": {"max_depth": [2, 4, None]},
+    }
+    return models, params
+
+
+def test_plan_model_workers_caps_total():
+    models, params = _candidates()
+    outer, inner = plan_model_workers(models, params, cv=3, max_workers=8)
+    assert outer * max(inner.values()) <= 8
+    assert inner["Linear_Regression"] == 1
+
+
+def test_evaluate_models_is_deterministic_across_worker_counts():
+    X_train, y_train, X_test, y_test = _data()
+    reports = []
+    for max_workers in (1, 2):
+        models, params = _candidates()
+        report = evaluate_models(X_train, y_train, X_test, y_test, models, params, max_workers=max_workers)
+        assert list(report) == list(models)
+        assert hasattr(models["Ridge"], "coef_")
+        assert report["Ridge"]["best_params"]["alpha"] in (0.1, 1.0, 10.0)
+        assert report["Ridge"]["cv_r2"] is not None
+        assert report["Linear_Regression"]["cv_r2"] is None
+        reports.append({name: scores["test_r2"] for name, scores in report.items()})
+    assert reports[0] == reports[1]
+
+
+def test_evaluate_models_search_strategies_and_budget():
+    X_train, y_train, X_test, y_test = _data()
+    for search in ("random", "halving"):
+        models, params = _candidates()
+        report = evaluate_models(X_train, y_train, X_test, y_test, models, params, max_workers=1,
+                                 search=search, n_iter=2)
+        assert report["Ridge"]["search"] == search
+        assert report["Linear_Regression"]["search"] == "none"
+
+    models, params = _candidates()
+    report = evaluate_models(X_train, y_train, X_test, y_test, models, params, max_workers=1, time_budget=0)
+    assert report["Ridge"]["search"] == "budget_exhausted"
+    assert report["Ridge"]["best_params"] == {}
+
+
+def test_evaluate_models_reports_costs(tmp_path):
+    from src.components.training_profiler import write_cost_report
+
+    X_train, y_train, X_test, y_test = _data()
+    models, params = _candidates()
+    report = evaluate_models(X_train, y_train, X_test, y_test, models, params, cv=3, max_workers=1,
+                             profile_dir=str(tmp_path / "profiles"))
+    assert report["Ridge"]["n_cells"] == 3 and report["Ridge"]["n_fits"] == 3 * 3 + 1
+    assert report["Linear_Regression"]["n_fits"] == 1
+    assert len(report["Decision Tree"]["cells"]) == 3
+    assert report["Ridge"]["peak_rss_mb"] > 0 and report["Ridge"]["cpu_seconds"] >= 0
+    assert (tmp_path / "profiles" / "Ridge.prof").exists()
+
+    cost = write_cost_report([{"model": name, **scores} for name, scores in report.items()],
+                             str(tmp_path / "cost.csv"), str(tmp_path / "cells.csv"))
+    assert set(cost["model"]) == set(models)
+    assert (tmp_path / "cells.csv").exists()
+
+
+def test_search_stops_dispatching_cells_after_deadline():
+    X_train, y_train, _, _ = _data()
+    grid = {"alpha": [0.01, 0.1, 1.0, 10.0, 100.0, 1000.0]}
+    for search in ("grid", "halving"):
+        gs = _make_search(Ridge(), grid, search, cv=3, n_jobs=1, n_iter=20, deadline=time.time())
+        gs.fit(X_train, y_train)
+        # Only the first round of cells ran; the best of them is still refit
+        assert gs.truncated_ and len(gs.cv_results_["params"]) == 1
+        assert hasattr(gs, "best_estimator_")
+
+    gs = _make_search(Ridge(), grid, "grid", cv=3, n_jobs=1, n_iter=20, deadline=time.time() + 3600)
+    gs.fit(X_train, y_train)
+    assert not gs.truncated_ and len(gs.cv_results_["params"]) == 6
+    plain = _make_search(Ridge(), grid, "grid", cv=3, n_jobs=1, n_iter=20).fit(X_train, y_train)
+    assert gs.best_params_ == plain.best_params_ and np.isclose(gs.best_score_, plain.best_score_)
+
+    gs = _make_search(Ridge(), grid, "halving", cv=3, n_jobs=1, n_iter=20, deadline=time.time() + 3600)
+    gs.fit(X_train, y_train)
+    # 6 cells on a sample, the best 2 of them on all rows
+    assert list(gs.cv_results_["iter"]) == [0] * 6 + [1] * 2 and gs.cv_results_["n_resources"][-1] == len(y_train)
+    assert gs.best_index_ >= 6 and gs.best_estimator_.alpha == gs.best_params_["alpha"]
+
+
+def test_profile_candidate_reports_worker_cpu_only_when_measurable(monkeypatch):
+    from src.components import training_profiler
+
+    monkeypatch.setattr(training_profiler, "_worker_processes", lambda: None)  # psutil not installed
+    with training_profiler.profile_candidate("sequential", n_jobs=1) as cost:
+        pass
+    assert cost["children_cpu_seconds"] is not None and cost["peak_rss_mb"] > 0
+    with training_profiler.profile_candidate("parallel", n_jobs=2) as cost:
+        pass
+    assert cost["children_cpu_seconds"] is None
+
+    monkeypatch.setattr(training_profiler, "_worker_processes", lambda: [])
+    with training_profiler.profile_candidate("parallel", n_jobs=2) as cost:
+        pass
+    assert cost["children_cpu_seconds"] == 0